@@ -1,92 +1,279 @@
 import os
 from dotenv import load_dotenv
 
-# Force reload of environment variables
-os.environ.clear()
-load_dotenv(override=True)
+# Load .env once per process; variables already set in the environment win
+load_dotenv()
 
-import requests
+import atexit
+import queue
+import threading
+import time
+import json
 import traceback
+import httpx
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    # HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+    _HTTP2 = False
 
 # Use environment variables for configuration
 API_BASE_URL = os.getenv("CHATBOT_API_URL", "http://localhost:8000")
 API_KEY = os.getenv("CHATBOT_API_KEY", "test-api-key")
 
-# Write debug info to a file
-with open("debug.log", "a") as f:
-    f.write(f"API_BASE_URL = {API_BASE_URL}\n")
-    f.write(f"API_KEY = {API_KEY}\n")
+def _dumps(obj) -> bytes:
+    """Serialize obj to a JSON request body."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+
+def _loads(content: bytes):
+    """Parse a JSON response body."""
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than json (e.g. NaN, huge ints); let the
+            # stdlib have a go before giving up
+            pass
+    return json.loads(content)
+
+
+# debug.log is only written when CHATBOT_DEBUG=1; otherwise log messages
+# are never even formatted.
+_DEBUG = os.getenv("CHATBOT_DEBUG") == "1"
+
+# Log events are handed to a background thread through a queue so the
+# request path never blocks on file I/O. The writer batches whatever
+# arrives within _LOG_FLUSH_INTERVAL (up to _LOG_FLUSH_BYTES) into a
+# single write.
+_LOG_FLUSH_BYTES = 64 * 1024
+_LOG_FLUSH_INTERVAL = 0.01
+_log_q = queue.SimpleQueue()
+
+
+def _drain_log():
+    """Writer thread: drain queued log events to the debug log in batches."""
+    while True:
+        item = _log_q.get()
+        batch = []
+        batch_bytes = 0
+        waiters = []
+        deadline = time.monotonic() + _LOG_FLUSH_INTERVAL
+        while True:
+            if isinstance(item, threading.Event):
+                # Flush request: write what we have right away
+                waiters.append(item)
+                break
+            batch.append(item)
+            batch_bytes += len(item)
+            remaining = deadline - time.monotonic()
+            if batch_bytes >= _LOG_FLUSH_BYTES or remaining <= 0:
+                break
+            try:
+                item = _log_q.get(timeout=remaining)
+            except queue.Empty:
+                break
+        if batch:
+            _LOG_FH.write(b"".join(batch))
+        if waiters:
+            # Explicit flush request: push the file buffer to the OS too
+            _LOG_FH.flush()
+        for waiter in waiters:
+            waiter.set()
+
+
+def _flush_log(timeout: float = 1.0):
+    """Block until everything queued so far has been written to disk."""
+    if not _DEBUG:
+        return
+    done = threading.Event()
+    _log_q.put(done)
+    done.wait(timeout)
+
+
+def _append_log(data: bytes):
+    """Queue encoded log lines for the debug log writer thread."""
+    _log_q.put(data)
+
+
+def _log_event(event: dict) -> bytes:
+    """Encode a log event as one timestamped JSON line."""
+    return _dumps({"ts": time.time_ns(), **event}) + b"\n"
+
+
+def _dbg(log_lines: list, event_fn):
+    """Collect the event returned by event_fn, only calling it in debug mode."""
+    if _DEBUG:
+        log_lines.append(_log_event(event_fn()))
+
+
+def _emit_log(log_lines: list):
+    """Hand all collected lines to the writer as a single chunk."""
+    if log_lines:
+        _append_log(b"".join(log_lines))
+        log_lines.clear()
+
+
+if _DEBUG:
+    # Keep the debug log open for the lifetime of the process instead of
+    # reopening it for every write. Only the writer thread touches it.
+    # Binary mode gets real 64 KB block buffering; text mode would flush
+    # on every newline.
+    _LOG_FH = open("debug.log", "ab", buffering=_LOG_FLUSH_BYTES)
+    atexit.register(_LOG_FH.close)
+    threading.Thread(target=_drain_log, name="debug-log-writer", daemon=True).start()
+    # Runs before the handle is closed (atexit is LIFO)
+    atexit.register(_flush_log)
+
+    # debug.log holds one JSON object per line
+    _append_log(_log_event({"event": "startup", "api_base_url": API_BASE_URL, "api_key": API_KEY}))
 
 HEADERS = {"X-API-Key": API_KEY}
+_JSON_HEADERS = {"Content-Type": "application/json"}
 
+# Backend endpoints, built once
+_CHAT_URL = f"{API_BASE_URL}/chat"
+_MESSAGES_URL_TMPL = f"{API_BASE_URL}/api/conversations/{{conv}}/messages"
 
-def send_message(message: str, user_email: str, conversation_id: str = None):
+# 3.05 s to connect, 27 s for everything else
+REQUEST_TIMEOUT = httpx.Timeout(27.0, connect=3.05)
+
+# Retry transient failures with exponential backoff. Connection errors are
+# retried by the transport for every method; read timeouts and 5xx gateway
+# responses only for GET, since replaying POST /chat could book a meeting
+# twice.
+_CONNECT_RETRIES = 2
+_GET_RETRIES = 2
+_RETRY_STATUSES = frozenset([502, 503, 504])
+_BACKOFF_FACTOR = 0.3
+
+# Shared client so requests to the backend reuse pooled keep-alive
+# connections (multiplexed over HTTP/2 when h2 is installed) instead of
+# opening a new one per message.
+_CLIENT = httpx.Client(
+    headers=HEADERS,
+    timeout=REQUEST_TIMEOUT,
+    transport=httpx.HTTPTransport(
+        http2=_HTTP2,
+        limits=httpx.Limits(max_keepalive_connections=10, max_connections=10),
+        retries=_CONNECT_RETRIES,
+    ),
+)
+atexit.register(_CLIENT.close)
+
+
+def _get(url: str) -> httpx.Response:
+    """GET url, retrying read timeouts and gateway errors with backoff."""
+    for attempt in range(_GET_RETRIES + 1):
+        try:
+            response = _CLIENT.get(url)
+        except httpx.ReadTimeout:
+            if attempt == _GET_RETRIES:
+                raise
+        else:
+            if response.status_code not in _RETRY_STATUSES or attempt == _GET_RETRIES:
+                return response
+        time.sleep(_BACKOFF_FACTOR * (2 ** attempt))
+
+
+def _post_chat(payload: dict):
     """
-    Send a message to the chatbot backend and return the response.
+    POST a chat payload to the backend and return the decoded response.
     """
-    url = f"{API_BASE_URL}/chat"
-    payload = {
-        "message": message,
-        "user_email": user_email,
-    }
-    if conversation_id:
-        payload["conversation_id"] = conversation_id
+    url = _CHAT_URL
+    log_lines = []
     
     # Write debug info before making the request
-    with open("debug.log", "a") as f:
-        f.write(f"\nSending request to: {url}\n")
-        f.write(f"Headers: {HEADERS}\n")
-        f.write(f"Payload: {payload}\n")
+    _dbg(log_lines, lambda: {"event": "request", "method": "POST", "url": url, "payload": payload})
     
     try:
-        response = requests.post(url, json=payload, headers=HEADERS, timeout=30)
+        response = _CLIENT.post(url, content=_dumps(payload), headers=_JSON_HEADERS)
         
         # Write debug info about the response
-        with open("debug.log", "a") as f:
-            f.write(f"Response status: {response.status_code}\n")
-            f.write(f"Response headers: {dict(response.headers)}\n")
+        # Headers only help when diagnosing a failed request
+        if response.status_code >= 400:
+            _dbg(log_lines, lambda: {"event": "response", "url": url, "status": response.status_code,
+                                     "headers": dict(response.headers)})
+        else:
+            _dbg(log_lines, lambda: {"event": "response", "url": url, "status": response.status_code})
         
         response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
+        return _loads(response.content)
+    except httpx.HTTPError as e:
         error_message = str(e)
         
         # Write detailed error info
-        with open("debug.log", "a") as f:
-            f.write(f"Error: {error_message}\n")
-            f.write(f"Traceback: {traceback.format_exc()}\n")
+        _dbg(log_lines, lambda: {"event": "error", "url": url, "error": error_message,
+                                 "traceback": traceback.format_exc()})
+        _emit_log(log_lines)
+        _flush_log()
         
         return {"error": error_message}
     except Exception as e:
         error_message = str(e)
         
         # Write detailed error info
-        with open("debug.log", "a") as f:
-            f.write(f"Unexpected error: {error_message}\n")
-            f.write(f"Traceback: {traceback.format_exc()}\n")
+        _dbg(log_lines, lambda: {"event": "unexpected_error", "url": url, "error": error_message,
+                                 "traceback": traceback.format_exc()})
+        _emit_log(log_lines)
+        _flush_log()
         
         return {"error": error_message}
+    finally:
+        _emit_log(log_lines)
+
+
+def _send_first(message: str, user_email: str):
+    """Send the first message of a session; the backend assigns the conversation id."""
+    return _post_chat({"message": message, "user_email": user_email})
+
+
+def _send_continue(message: str, user_email: str, conversation_id: str):
+    """Send a message to an existing conversation."""
+    return _post_chat({"message": message, "user_email": user_email, "conversation_id": conversation_id})
+
+
+def send_message(message: str, user_email: str, conversation_id: str = None):
+    """
+    Send a message to the chatbot backend and return the response.
+    """
+    if conversation_id:
+        return _send_continue(message, user_email, conversation_id)
+    return _send_first(message, user_email)
 
 
 def get_conversation_messages(conversation_id: str):
     """
     Retrieve the message history for a conversation.
     """
-    url = f"{API_BASE_URL}/api/conversations/{conversation_id}/messages"
+    url = _MESSAGES_URL_TMPL.format(conv=conversation_id)
+    
+    log_lines = []
     
     # Write debug info before making the request
-    with open("debug.log", "a") as f:
-        f.write(f"\nFetching messages from: {url}\n")
+    _dbg(log_lines, lambda: {"event": "request", "method": "GET", "url": url})
     
     try:
-        response = requests.get(url, headers=HEADERS, timeout=30)
+        response = _get(url)
         response.raise_for_status()
-        return response.json()
+        return _loads(response.content)
     except Exception as e:
         error_message = str(e)
         
         # Write error info
-        with open("debug.log", "a") as f:
-            f.write(f"Error fetching messages: {error_message}\n")
+        _dbg(log_lines, lambda: {"event": "error", "url": url, "error": error_message})
+        _emit_log(log_lines)
+        _flush_log()
         
-        return {"error": error_message} 
\ No newline at end of file
+        return {"error": error_message}
+    finally:
+        _emit_log(log_lines)
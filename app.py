@@ -1,22 +1,93 @@
 import streamlit as st
 import os
+import json
 from dotenv import load_dotenv
 
-# Force reload of environment variables
-os.environ.clear()
-load_dotenv(override=True)
+# Load .env once per session; variables already set in the environment win
+if "env_loaded" not in st.session_state:
+    load_dotenv()
+    st.session_state.env_loaded = True
 
-# Write debug info to a file
-with open("debug.log", "w") as f:
-    f.write(f"CHATBOT_API_URL = {os.getenv('CHATBOT_API_URL')}\n")
-    f.write(f"Current working directory = {os.getcwd()}\n")
+# Write debug info to a file, once per session rather than on every rerun
+if "boot_logged" not in st.session_state:
+    with open("debug.log", "a") as f:
+        f.write(json.dumps({"event": "app_start", "chatbot_api_url": os.getenv("CHATBOT_API_URL"), "cwd": os.getcwd()}) + "\n")
+    st.session_state.boot_logged = True
 
 from api_service import send_message, get_conversation_messages
 import io
-import json
 
 st.set_page_config(page_title="Cal.com Scheduler Chatbot", page_icon="🤖", layout="centered")
 
+
+class _HistoryError(Exception):
+    """The backend couldn't return a conversation's history."""
+
+
+@st.cache_data(show_spinner=False)
+def _cached_history(conversation_id: str, version: int):
+    """
+    Fetch conversation history, cached until `version` is bumped.
+    
+    Errors are raised rather than returned: st.cache_data doesn't cache
+    exceptions, so a transient failure is retried on the next run.
+    """
+    history = get_conversation_messages(conversation_id)
+    if isinstance(history, dict) and "error" in history:
+        raise _HistoryError(history["error"])
+    return history
+
+
+@st.cache_data(show_spinner=False)
+def _export_text(messages: tuple) -> str:
+    """Build the chat history download body from (role, content) pairs."""
+    chat_text = io.StringIO()
+    for role, content in messages:
+        speaker = "You" if role == "user" else "Bot"
+        chat_text.write(f"{speaker}: {content}\n")
+    return chat_text.getvalue()
+
+
+# Callbacks run before the next script run, so state changes made here are
+# picked up without forcing an extra rerun.
+def _clear_conversation():
+    st.session_state.conversation_id = None
+    st.session_state.messages = []
+    st.session_state.error = None
+    st.session_state.history_loaded = False
+
+
+def _retry_connection():
+    st.session_state.error = None
+    st.session_state.history_version += 1
+    st.session_state.history_loaded = False
+
+
+def _submit_message():
+    user_input = st.session_state.user_input
+    if not user_input or not user_input.strip():
+        return
+
+    # Add user message to local state first for immediate feedback
+    st.session_state.messages.append({"role": "user", "content": user_input})
+    
+    with st.spinner("Bot is thinking..."):
+        try:
+            response = send_message(user_input, st.session_state.user_email, st.session_state.conversation_id)
+            
+            if "error" in response:
+                st.session_state.error = response["error"]
+            else:
+                st.session_state.error = None
+                st.session_state.conversation_id = response.get("conversation_id", st.session_state.conversation_id)
+                # Add bot message to local state
+                st.session_state.messages.append({"role": "assistant", "content": response.get("response", "")})
+                # The reply is already in local state, no need to refetch the history
+                st.session_state.history_loaded = True
+        except Exception as e:
+            st.session_state.error = str(e)
+
+
 # --- Welcome Message ---
 st.title("Cal.com Scheduler Chatbot 🤖")
 st.markdown("""
@@ -45,35 +116,40 @@ if "messages" not in st.session_state:
     st.session_state.messages = []
 if "error" not in st.session_state:
     st.session_state.error = None
+if "history_version" not in st.session_state:
+    st.session_state.history_version = 0
+if "history_loaded" not in st.session_state:
+    st.session_state.history_loaded = False
 
 # --- Chat Controls ---
 col1, col2 = st.columns([1, 1])
 with col1:
-    if st.button("🧹 Clear Conversation"):
-        st.session_state.conversation_id = None
-        st.session_state.messages = []
-        st.session_state.error = None
-        st.experimental_rerun()
+    st.button("🧹 Clear Conversation", on_click=_clear_conversation)
 with col2:
     if st.session_state.messages:
-        chat_text = io.StringIO()
-        for msg in st.session_state.messages:
-            role = "You" if msg.get("role") == "user" else "Bot"
-            chat_text.write(f"{role}: {msg['content']}\n")
-        st.download_button("⬇️ Export Chat History", chat_text.getvalue(), file_name="chat_history.txt")
+        chat_text = _export_text(tuple((msg.get("role"), msg["content"]) for msg in st.session_state.messages))
+        st.download_button("⬇️ Export Chat History", chat_text, file_name="chat_history.txt")
 
 # --- Chat History Display ---
 st.markdown("---")
 st.subheader("Chat History")
 if st.session_state.conversation_id:
+    if st.button("🔄 Sync history"):
+        st.session_state.history_version += 1
+        st.session_state.history_loaded = False
+
+# Local messages are authoritative once loaded; only hit the backend when
+# we have nothing yet or the user asked to resync.
+if st.session_state.conversation_id and not st.session_state.history_loaded:
     with st.spinner("Loading conversation history..."):
         try:
-            history = get_conversation_messages(st.session_state.conversation_id)
+            history = _cached_history(st.session_state.conversation_id, st.session_state.history_version)
             if isinstance(history, list):
                 st.session_state.messages = history
                 st.session_state.error = None
-            elif isinstance(history, dict) and "error" in history:
-                st.session_state.error = history["error"]
+                st.session_state.history_loaded = True
+        except _HistoryError as e:
+            st.session_state.error = str(e)
         except Exception as e:
             st.session_state.error = str(e)
 
@@ -82,44 +158,16 @@ if st.session_state.error:
     st.error(f"Error: {st.session_state.error}")
     
     # Add a Retry button
-    if st.button("Retry Connection"):
-        st.session_state.error = None
-        st.experimental_rerun()
+    st.button("Retry Connection", on_click=_retry_connection)
 
 for msg in st.session_state.messages:
-    if msg.get("role") == "user":
-        st.markdown(f"<div style='text-align: right; color: #2563eb;'><b>You:</b> {msg['content']}</div>", unsafe_allow_html=True)
-    else:
-        st.markdown(f"<div style='text-align: left; color: #059669;'><b>Bot:</b> {msg['content']}</div>", unsafe_allow_html=True)
+    with st.chat_message("user" if msg.get("role") == "user" else "assistant"):
+        st.markdown(msg["content"])
 
 st.markdown("---")
 
 # --- Message Input ---
-with st.form(key="chat_form", clear_on_submit=True):
-    user_input = st.text_input("Type your message:", key="user_input")
-    submitted = st.form_submit_button("Send")
-
-if submitted and user_input.strip():
-    # Add user message to local state first for immediate feedback
-    st.session_state.messages.append({"role": "user", "content": user_input})
-    
-    with st.spinner("Bot is thinking..."):
-        try:
-            response = send_message(user_input, st.session_state.user_email, st.session_state.conversation_id)
-            
-            if "error" in response:
-                st.session_state.error = response["error"]
-                st.error(f"Error: {response['error']}")
-            else:
-                st.session_state.error = None
-                st.session_state.conversation_id = response.get("conversation_id", st.session_state.conversation_id)
-                # Add bot message to local state
-                st.session_state.messages.append({"role": "assistant", "content": response.get("response", "")})
-        except Exception as e:
-            st.session_state.error = str(e)
-            st.error(f"Error: {str(e)}")
-    
-    st.experimental_rerun()
+st.chat_input("Type your message:", key="user_input", on_submit=_submit_message)
 
 # --- Footer ---
 st.markdown("<hr style='margin-top:2em;'>", unsafe_allow_html=True)
@@ -0,0 +1,57 @@
+"""
+Shared pytest fixtures for the integration scripts in the project root.
+
+These scripts talk to the real OpenAI and Cal.com APIs, so tests that need
+the live agent are skipped unless both API keys are configured.
+"""
+
+import asyncio
+
+import pytest
+import pytest_asyncio
+
+from src.utils.config import OPENAI_API_KEY, CAL_API_KEY
+
+
+def new_agent(cal_api, user_email: str = "test@example.com"):
+    """
+    Create an agent for one conversation, sharing the given Cal.com client.
+    
+    Scripts that run several conversations at once give each its own agent
+    (and so its own history) while reusing one connection pool. Plain
+    function rather than a fixture so the scripts' standalone main() can
+    use it too.
+    """
+    from src.bot.chatbot import CalendarAgent
+    agent = CalendarAgent()
+    agent.cal_api = cal_api
+    agent.conversation_context["current_user_email"] = user_email
+    return agent
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """One event loop for the whole session, so session-scoped async fixtures can be shared."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def cal_api():
+    """A single CalAPIClient, and its connection pools, shared by every test in the session."""
+    if not CAL_API_KEY:
+        pytest.skip("CAL_API_KEY is required for live Cal.com API tests")
+    from src.api.cal_api import CalAPIClient
+    async with CalAPIClient() as client:
+        yield client
+
+
+@pytest_asyncio.fixture(scope="session")
+async def agent():
+    """A single initialized CalendarAgent shared by every test in the session."""
+    if not (OPENAI_API_KEY and CAL_API_KEY):
+        pytest.skip("OPENAI_API_KEY and CAL_API_KEY are required for live agent tests")
+    from src.bot.chatbot import CalendarAgent
+    async with CalendarAgent() as agent:
+        yield agent
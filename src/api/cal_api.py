@@ -3,15 +3,114 @@ Cal.com API client for the Calendar Agent.
 This module handles all interactions with the Cal.com API.
 """
 
+import asyncio
+import bisect
 import logging
+import random
+from contextlib import asynccontextmanager
 from typing import Dict, Any, List, Optional
 import httpx
 from src.utils.config import CAL_API_KEY, CAL_API_URL, logger
 import json
+import sys
+import time
 import aiohttp
 from datetime import datetime, timedelta
 import traceback
 
+try:
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:
+    # HTTP/2 needs the optional h2 package (pip install "httpx[http2]")
+    _HTTP2 = False
+
+try:
+    import ciso8601
+except ImportError:
+    ciso8601 = None
+
+# The event-type catalog is effectively static, so successful lookups are
+# shared by every client in the process for _EVENT_TYPES_TTL seconds.
+# Keyed by (lookup, API URL, API key); values are (fetched_at, result).
+_EVENT_TYPES_TTL = 300.0
+_event_types_cache: Dict[tuple, tuple] = {}
+# Fetches currently in flight, by the same key, so concurrent cache misses
+# share one request instead of each going to the API
+_event_types_inflight: Dict[tuple, "asyncio.Future"] = {}
+
+# Pool sizing for the aiohttp session: enough per-host connections for the
+# gathered availability probes without flooding Cal.com. DNS answers are
+# cached for 5 minutes, and idle connections are kept for 75 s, just past
+# typical load balancer idle timeouts. Requests are capped at 30 s in total,
+# the same as the httpx client, rather than aiohttp's 5 minute default.
+_AIOHTTP_LIMIT = 32
+_AIOHTTP_LIMIT_PER_HOST = 8
+_AIOHTTP_DNS_TTL = 300
+_AIOHTTP_KEEPALIVE = 75
+_AIOHTTP_TIMEOUT = 30.0
+
+# Rate-limited (429) and transient server errors are retried with exponential
+# backoff and jitter, honouring Retry-After when the server sends one.
+_RETRY_STATUSES = frozenset([429, 500, 502, 503, 504])
+_MAX_RETRIES = 3
+_BACKOFF_BASE = 1.0
+_BACKOFF_JITTER = 0.5
+_BACKOFF_CAP = 30.0
+
+# Successful availability lookups are reused by the same client for this many
+# seconds, so conversations asking about the same dates share one request.
+# Any booking change made through the client drops them.
+_AVAILABILITY_TTL = 30.0
+
+
+def _parse_iso(value: str) -> datetime:
+    """
+    Parse an ISO 8601 timestamp from Cal.com (e.g. 2025-05-14T20:30:00.000Z).
+    
+    Raises ValueError if the string isn't a valid timestamp.
+    """
+    # From 3.11 fromisoformat accepts "Z" and is as fast as ciso8601
+    if sys.version_info >= (3, 11):
+        return datetime.fromisoformat(value)
+    if ciso8601 is not None:
+        return ciso8601.parse_datetime(value)
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+
+class AvailabilityIndex:
+    """
+    Answers "is this time available?" from a single get_availability() result,
+    so several candidate times can be checked without another API call each.
+    """
+    
+    def __init__(self, date_ranges: List[tuple], dates: set):
+        """
+        Args:
+            date_ranges: Non-overlapping (start, end) datetimes, sorted by start
+            dates: YYYY-MM-DD dates that have at least one range
+        """
+        self._ranges = date_ranges
+        self._starts = [start for start, _ in date_ranges]
+        self._dates = dates
+    
+    def __contains__(self, datetime_str: str) -> bool:
+        """
+        Check a time in ISO 8601 format with timezone (e.g., 2025-05-14T20:30:00.000Z).
+        
+        Mirrors is_time_available: a time is available if it falls within a
+        range, or, more permissively, if any range exists on its date.
+        """
+        try:
+            requested_dt = _parse_iso(datetime_str)
+        except ValueError:
+            return False
+        
+        i = bisect.bisect_right(self._starts, requested_dt) - 1
+        if i >= 0 and requested_dt < self._ranges[i][1]:
+            return True
+        return requested_dt.date().isoformat() in self._dates
+
 class CalAPIClient:
     """
     Client for interacting with the Cal.com API.
@@ -31,18 +130,124 @@ class CalAPIClient:
             "Content-Type": "application/json",
             "Authorization": f"Bearer {self.api_key}"
         }
-        self.client = httpx.AsyncClient(headers=self.headers, timeout=30.0)
+        # One pooled client per CalAPIClient; the API server shares a single
+        # instance across requests so connections are kept alive between them
+        self.client = httpx.AsyncClient(
+            headers=self.headers,
+            timeout=30.0,
+            http2=_HTTP2,
+            limits=httpx.Limits(max_keepalive_connections=100)
+        )
+        
+        # aiohttp session for the endpoints that go through apiKey query auth;
+        # created on first use since it must be bound to a running loop
+        self._session: Optional[aiohttp.ClientSession] = None
         
         # Cache for user data
         self._cached_user = None
         
+        # Availability results keyed by (event type, start date, end date);
+        # values are (fetched_at, result)
+        self._availability_cache: Dict[tuple, tuple] = {}
+        # Lookups currently in flight, by the same key, so concurrent checks
+        # of the same dates (e.g. several spellings of one time) share a fetch
+        self._availability_inflight: Dict[tuple, "asyncio.Future"] = {}
+        
     async def __aenter__(self):
         """Support for async context manager."""
         return self
         
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         """Clean up resources when exiting context."""
+        await self.cleanup()
+    
+    async def cleanup(self):
+        """Close the underlying HTTP clients."""
         await self.client.aclose()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+    
+    def _get_session(self) -> aiohttp.ClientSession:
+        """Return the pooled aiohttp session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=_AIOHTTP_LIMIT,
+                    limit_per_host=_AIOHTTP_LIMIT_PER_HOST,
+                    ttl_dns_cache=_AIOHTTP_DNS_TTL,
+                    keepalive_timeout=_AIOHTTP_KEEPALIVE,
+                ),
+                timeout=aiohttp.ClientTimeout(total=_AIOHTTP_TIMEOUT),
+            )
+        return self._session
+    
+    def _retry_delay(self, response: aiohttp.ClientResponse, attempt: int) -> float:
+        """Seconds to wait before retrying, preferring the server's Retry-After."""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), _BACKOFF_CAP)
+            except ValueError:
+                pass  # HTTP-date form; fall back to our own backoff
+        delay = _BACKOFF_BASE * (2 ** attempt) * (1 + random.uniform(0, _BACKOFF_JITTER))
+        return min(delay, _BACKOFF_CAP)
+    
+    @asynccontextmanager
+    async def _request(self, method: str, url: str, retry_statuses=_RETRY_STATUSES, **kwargs):
+        """
+        Send a request on the pooled session, retrying rate-limit and server
+        errors with backoff, and yield the final response.
+        """
+        session = self._get_session()
+        for attempt in range(_MAX_RETRIES + 1):
+            response = await session.request(method, url, **kwargs)
+            if response.status in retry_statuses and attempt < _MAX_RETRIES:
+                delay = self._retry_delay(response, attempt)
+                response.release()
+                self.logger.warning(f"{method} {url} returned HTTP {response.status}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            try:
+                yield response
+            finally:
+                response.release()
+            return
+    
+    def _get_cached_event_types(self, lookup: str) -> Optional[Dict[str, Any]]:
+        """Return a still-fresh cached event-type result for this API key, if any."""
+        entry = _event_types_cache.get((lookup, self.api_url, self.api_key))
+        if entry is not None and time.monotonic() - entry[0] < _EVENT_TYPES_TTL:
+            self.logger.info(f"Using cached {lookup}")
+            return entry[1]
+        return None
+    
+    def _cache_event_types(self, lookup: str, result: Dict[str, Any]) -> None:
+        """Remember a successful event-type result for this API key."""
+        _event_types_cache[(lookup, self.api_url, self.api_key)] = (time.monotonic(), result)
+    
+    async def _cached_event_type_lookup(self, lookup: str, fetch) -> Dict[str, Any]:
+        """
+        Return a cached event-type result, or run fetch() to get one.
+        
+        Concurrent callers missing the same entry wait on a single fetch.
+        Only successful results are cached.
+        """
+        cached = self._get_cached_event_types(lookup)
+        if cached is not None:
+            return cached
+        
+        key = (lookup, self.api_url, self.api_key)
+        future = _event_types_inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fetch())
+            _event_types_inflight[key] = future
+            future.add_done_callback(lambda _: _event_types_inflight.pop(key, None))
+        # Shielded so one caller being cancelled doesn't cancel the others' fetch
+        result = await asyncio.shield(future)
+        if result.get("status") != "error":
+            self._cache_event_types(lookup, result)
+        return result
     
     async def test_api_connection(self) -> bool:
         """
@@ -77,7 +282,10 @@ class CalAPIClient:
             A dictionary containing event types
         """
         self.logger.info("Getting event types")
-        
+        return await self._cached_event_type_lookup("event_types", self._fetch_event_types)
+    
+    async def _fetch_event_types(self) -> Dict[str, Any]:
+        """Fetch all event types from the API, bypassing the cache."""
         try:
             url = f"{self.api_url}/event-types"
             response = await self.client.get(url, params={"apiKey": self.api_key})
@@ -129,7 +337,7 @@ class CalAPIClient:
                 "apiKey": self.api_key
             }
             
-            self.logger.debug(f"Requesting slots with params: {params}")
+            self.logger.debug("Requesting slots with params: %s", params)
             response = await self.client.get(url, params=params)
             response.raise_for_status()
             data = response.json()
@@ -184,21 +392,20 @@ class CalAPIClient:
             # First, get the event type details to determine exact duration
             url = f"{self.api_url}/event-types/{event_type_id}"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params={"apiKey": self.api_key}) as response:
-                    if response.status != 200:
-                        self.logger.error(f"Failed to get event type details: HTTP {response.status}")
-                        # Default to 30 minutes if we can't get details
-                        event_duration = 30
-                    else:
-                        event_data = await response.json()
-                        event_duration = event_data.get("length", 30)
-                        self.logger.info(f"Retrieved event duration from API: {event_duration} minutes")
+            async with self._request("GET", url, params={"apiKey": self.api_key}) as response:
+                if response.status != 200:
+                    self.logger.error(f"Failed to get event type details: HTTP {response.status}")
+                    # Default to 30 minutes if we can't get details
+                    event_duration = 30
+                else:
+                    event_data = await response.json()
+                    event_duration = event_data.get("length", 30)
+                    self.logger.info(f"Retrieved event duration from API: {event_duration} minutes")
             
             # Calculate end time based on start time and exact event duration
             try:
                 # Parse the start time and add the duration
-                start_dt = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
+                start_dt = _parse_iso(start_time)
                 end_dt = start_dt + timedelta(minutes=event_duration)
                 
                 # Format end time as ISO 8601
@@ -249,42 +456,47 @@ class CalAPIClient:
                 payload["responses"]["notes"] = reason
                 
             # Change from debug to info for better visibility
-            self.logger.info(f"Booking payload: {json.dumps(payload)}")
-            
-            async with aiohttp.ClientSession() as session:
-                async with session.post(
-                    booking_url, 
-                    params={"apiKey": self.api_key},
-                    json=payload,
-                    headers={"Content-Type": "application/json"}
-                ) as response:
-                    response_status = response.status
-                    response_text = await response.text()
-                    
-                    # Change from debug to info for better visibility
-                    self.logger.info(f"Booking response ({response_status}): {response_text}")
-                    
-                    try:
-                        response_data = json.loads(response_text)
-                    except json.JSONDecodeError:
-                        self.logger.error(f"Invalid JSON response: {response_text}")
-                        return {
-                            "status": "error",
-                            "message": f"Failed to book meeting: Invalid response from server",
-                            "details": response_text
-                        }
-                    
-                    if response_status == 200 or response_status == 201:
-                        self.logger.info(f"Successfully booked meeting with ID: {response_data.get('uid', 'unknown')}")
-                        return response_data
-                    else:
-                        error_message = response_data.get('message', 'Unknown error')
-                        self.logger.error(f"Failed to book meeting: {error_message}")
-                        return {
-                            "status": "error",
-                            "message": f"Failed to book meeting: {error_message}",
-                            "details": response_data
-                        }
+            if self.logger.isEnabledFor(logging.INFO):
+                self.logger.info(f"Booking payload: {json.dumps(payload)}")
+            
+            # Only a 429 is safe to retry here; after a 5xx the booking may
+            # already exist, and replaying it could book the slot twice
+            async with self._request(
+                "POST",
+                booking_url, 
+                params={"apiKey": self.api_key},
+                json=payload,
+                headers={"Content-Type": "application/json"},
+                retry_statuses=frozenset([429])
+            ) as response:
+                response_status = response.status
+                response_text = await response.text()
+                
+                # Change from debug to info for better visibility
+                self.logger.info(f"Booking response ({response_status}): {response_text}")
+                
+                try:
+                    response_data = json.loads(response_text)
+                except json.JSONDecodeError:
+                    self.logger.error(f"Invalid JSON response: {response_text}")
+                    return {
+                        "status": "error",
+                        "message": f"Failed to book meeting: Invalid response from server",
+                        "details": response_text
+                    }
+                
+                if response_status == 200 or response_status == 201:
+                    self.logger.info(f"Successfully booked meeting with ID: {response_data.get('uid', 'unknown')}")
+                    self.invalidate_availability()
+                    return response_data
+                else:
+                    error_message = response_data.get('message', 'Unknown error')
+                    self.logger.error(f"Failed to book meeting: {error_message}")
+                    return {
+                        "status": "error",
+                        "message": f"Failed to book meeting: {error_message}",
+                        "details": response_data
+                    }
         except Exception as e:
             self.logger.error(f"Exception while booking event: {str(e)}")
             self.logger.error(f"Traceback: {traceback.format_exc()}")
@@ -357,6 +569,7 @@ class CalAPIClient:
             response.raise_for_status()
             data = response.json() if response.text else {}
             self.logger.info(f"Successfully cancelled booking {booking_id}")
+            self.invalidate_availability()
             return {
                 "status": "success",
                 "booking_id": booking_id,
@@ -400,6 +613,7 @@ class CalAPIClient:
             response.raise_for_status()
             data = response.json() if response.text else {}
             self.logger.info(f"Successfully rescheduled booking {booking_id}")
+            self.invalidate_availability()
             return {
                 "status": "success",
                 "booking_id": booking_id,
@@ -442,49 +656,48 @@ class CalAPIClient:
         try:
             url = f"{self.api_url}/users"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params={"apiKey": self.api_key}) as response:
-                    response_status = response.status
-                    response_text = await response.text()
+            async with self._request("GET", url, params={"apiKey": self.api_key}) as response:
+                response_status = response.status
+                response_text = await response.text()
+                
+                if response_status != 200:
+                    self.logger.error(f"Failed to get user information: HTTP {response_status}")
+                    self.logger.error(f"Response: {response_text}")
+                    return {
+                        "status": "error",
+                        "message": f"Failed to get user information: HTTP {response_status}",
+                        "details": response_text
+                    }
+                
+                try:
+                    data = json.loads(response_text)
+                    users = data.get("users", [])
                     
-                    if response_status != 200:
-                        self.logger.error(f"Failed to get user information: HTTP {response_status}")
-                        self.logger.error(f"Response: {response_text}")
+                    if users:
+                        # Use the first user in the list
+                        user = users[0]
+                        self.logger.info(f"Found user: {user.get('name')} (ID: {user.get('id')})")
+                        
+                        # Cache the user data
+                        self._cached_user = user
+                        
                         return {
-                            "status": "error",
-                            "message": f"Failed to get user information: HTTP {response_status}",
-                            "details": response_text
+                            "status": "success",
+                            "user": user
                         }
-                    
-                    try:
-                        data = json.loads(response_text)
-                        users = data.get("users", [])
-                        
-                        if users:
-                            # Use the first user in the list
-                            user = users[0]
-                            self.logger.info(f"Found user: {user.get('name')} (ID: {user.get('id')})")
-                            
-                            # Cache the user data
-                            self._cached_user = user
-                            
-                            return {
-                                "status": "success",
-                                "user": user
-                            }
-                        else:
-                            self.logger.error("No users found in response")
-                            return {
-                                "status": "error",
-                                "message": "No users found in response"
-                            }
-                    except json.JSONDecodeError:
-                        self.logger.error(f"Invalid JSON in user response: {response_text}")
+                    else:
+                        self.logger.error("No users found in response")
                         return {
                             "status": "error",
-                            "message": "Invalid JSON in API response",
-                            "details": response_text
+                            "message": "No users found in response"
                         }
+                except json.JSONDecodeError:
+                    self.logger.error(f"Invalid JSON in user response: {response_text}")
+                    return {
+                        "status": "error",
+                        "message": "Invalid JSON in API response",
+                        "details": response_text
+                    }
         except Exception as e:
             self.logger.error(f"Error getting user information: {str(e)}")
             return {
@@ -510,8 +723,42 @@ class CalAPIClient:
         if not end_date:
             start_datetime = datetime.strptime(start_date, "%Y-%m-%d")
             end_datetime = start_datetime + timedelta(days=7)
-            end_date = end_datetime.strftime("%Y-%m-%d")
-            
+            end_date = end_datetime.date().isoformat()
+        
+        cache_key = (str(event_type_id), start_date, end_date)
+        cached = self._availability_cache.get(cache_key)
+        if cached is not None and time.monotonic() - cached[0] < _AVAILABILITY_TTL:
+            self.logger.info("Using cached availability")
+            return cached[1]
+        
+        future = self._availability_inflight.get(cache_key)
+        if future is None:
+            future = asyncio.ensure_future(self._fetch_availability(event_type_id, start_date, end_date))
+            self._availability_inflight[cache_key] = future
+            future.add_done_callback(lambda done: self._store_availability(cache_key, done))
+        # Shielded so one caller being cancelled doesn't cancel the others' fetch
+        return await asyncio.shield(future)
+    
+    def _store_availability(self, cache_key: tuple, future: "asyncio.Future") -> None:
+        """Cache a finished availability fetch unless it was invalidated meanwhile."""
+        if self._availability_inflight.get(cache_key) is not future:
+            return
+        del self._availability_inflight[cache_key]
+        if future.cancelled() or future.exception() is not None:
+            return
+        result = future.result()
+        if result.get("status") == "success":
+            self._availability_cache[cache_key] = (time.monotonic(), result)
+    
+    def invalidate_availability(self) -> None:
+        """Forget cached availability, e.g. after a booking changes the calendar."""
+        self._availability_cache.clear()
+        # Fetches started before the change still answer their callers but
+        # are not cached
+        self._availability_inflight.clear()
+    
+    async def _fetch_availability(self, event_type_id: str, start_date: str, end_date: str) -> Dict[str, Any]:
+        """Request availability from the API; see get_availability."""
         # First, get the user ID
         user_result = await self.get_user()
         if user_result.get("status") != "success":
@@ -547,34 +794,33 @@ class CalAPIClient:
             
             self.logger.info(f"Getting availability with params: {params}")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    response_status = response.status
-                    response_text = await response.text()
-                    
-                    if response_status != 200:
-                        self.logger.error(f"Failed to get availability: HTTP {response_status}")
-                        self.logger.error(f"Response: {response_text}")
-                        return {
-                            "status": "error",
-                            "message": f"Failed to get availability: HTTP {response_status}",
-                            "details": response_text
-                        }
-                    
-                    try:
-                        response_data = json.loads(response_text)
-                        return {
-                            "status": "success",
-                            "availability": response_data
-                        }
-                    except json.JSONDecodeError:
-                        self.logger.error(f"Invalid JSON in availability response: {response_text}")
-                        return {
-                            "status": "error",
-                            "message": "Invalid JSON in API response",
-                            "details": response_text
-                        }
+            async with self._request("GET", url, params=params) as response:
+                response_status = response.status
+                response_text = await response.text()
                 
+                if response_status != 200:
+                    self.logger.error(f"Failed to get availability: HTTP {response_status}")
+                    self.logger.error(f"Response: {response_text}")
+                    return {
+                        "status": "error",
+                        "message": f"Failed to get availability: HTTP {response_status}",
+                        "details": response_text
+                    }
+                
+                try:
+                    response_data = json.loads(response_text)
+                    return {
+                        "status": "success",
+                        "availability": response_data
+                    }
+                except json.JSONDecodeError:
+                    self.logger.error(f"Invalid JSON in availability response: {response_text}")
+                    return {
+                        "status": "error",
+                        "message": "Invalid JSON in API response",
+                        "details": response_text
+                    }
+            
         except Exception as e:
             self.logger.error(f"Error getting availability: {str(e)}")
             return {
@@ -582,6 +828,59 @@ class CalAPIClient:
                 "message": f"Error getting availability: {str(e)}"
             }
             
+    def build_availability_index(self, availability_result: Dict[str, Any]) -> AvailabilityIndex:
+        """
+        Index a get_availability() result for local availability checks.
+        
+        Use this instead of calling is_time_available once per candidate time
+        when the availability for the date has already been fetched.
+        
+        Args:
+            availability_result: The dictionary returned by get_availability
+            
+        Returns:
+            An AvailabilityIndex; `datetime_str in index` checks a single time.
+            A failed lookup gives an empty index, so every check is False.
+        """
+        if availability_result.get("status") != "success":
+            return AvailabilityIndex([], set())
+        
+        date_ranges = availability_result.get("availability", {}).get("dateRanges", [])
+        self.logger.info(f"Indexing {len(date_ranges)} date ranges")
+        
+        parsed = []
+        dates = set()
+        for date_range in date_ranges:
+            start_str = date_range.get("start", "")
+            end_str = date_range.get("end", "")
+            
+            if start_str:
+                dates.add(start_str[:10])
+            if not start_str or not end_str:
+                continue
+            
+            self.logger.debug("Range: %s to %s", start_str, end_str)
+            try:
+                parsed.append((
+                    _parse_iso(start_str),
+                    _parse_iso(end_str)
+                ))
+            except ValueError as e:
+                self.logger.error(f"Error parsing date range: {str(e)}")
+        
+        # Merge overlapping ranges so a bisect on the starts finds the only
+        # range that could contain a given time
+        parsed.sort()
+        merged = []
+        for start, end in parsed:
+            if merged and start <= merged[-1][1]:
+                if end > merged[-1][1]:
+                    merged[-1] = (merged[-1][0], end)
+            else:
+                merged.append((start, end))
+        
+        return AvailabilityIndex(merged, dates)
+
     async def is_time_available(
         self, 
         event_type_id: str,
@@ -601,15 +900,15 @@ class CalAPIClient:
         
         try:
             # Parse the requested datetime (in UTC)
-            requested_dt = datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
+            requested_dt = _parse_iso(datetime_str)
             
             # Convert requested time to PST for visual logging (for debugging only)
-            pst_offset = timedelta(hours=-8)
-            requested_dt_pst = requested_dt + pst_offset
-            self.logger.info(f"Checking availability for UTC: {requested_dt.isoformat()} (PST: {requested_dt_pst.isoformat()})")
+            if self.logger.isEnabledFor(logging.INFO):
+                requested_dt_pst = requested_dt + timedelta(hours=-8)
+                self.logger.info(f"Checking availability for UTC: {requested_dt.isoformat()} (PST: {requested_dt_pst.isoformat()})")
             
             # Extract the date part for availability lookup
-            requested_date = requested_dt.strftime("%Y-%m-%d")
+            requested_date = requested_dt.date().isoformat()
             
             # Get available slots for the date
             availability_result = await self.get_availability(
@@ -622,55 +921,9 @@ class CalAPIClient:
                 # Be conservative and return False if we couldn't get availability
                 return False
             
-            # Extract the date ranges from availability response
-            availability_data = availability_result.get("availability", {})
-            date_ranges = availability_data.get("dateRanges", [])
-            
-            self.logger.info(f"Checking {len(date_ranges)} date ranges for {datetime_str}")
-            
-            # Debug information - show all date ranges
-            for i, date_range in enumerate(date_ranges):
-                start_str = date_range.get("start")
-                end_str = date_range.get("end")
-                self.logger.info(f"Range {i+1}: {start_str} to {end_str}")
-            
-            # Properly check if the requested time falls within any of the available ranges
-            for date_range in date_ranges:
-                start_str = date_range.get("start", "")
-                end_str = date_range.get("end", "")
-                
-                if not start_str or not end_str:
-                    continue
-                
-                try:
-                    # Parse the range start and end times
-                    range_start = datetime.fromisoformat(start_str.replace('Z', '+00:00'))
-                    range_end = datetime.fromisoformat(end_str.replace('Z', '+00:00'))
-                    
-                    # Check if the requested time falls within this range
-                    if range_start <= requested_dt < range_end:
-                        self.logger.info(f"Time {datetime_str} falls within range {start_str} to {end_str}")
-                        return True
-                except ValueError as e:
-                    self.logger.error(f"Error parsing date range: {str(e)}")
-                    continue
-            
-            # Fallback check: Consider available if any range exists for the requested date
-            # This is a more permissive approach as the API's date ranges might have timezone issues
-            has_date_ranges_for_requested_date = False
-            for date_range in date_ranges:
-                start_str = date_range.get("start", "")
-                if start_str and requested_date in start_str:
-                    has_date_ranges_for_requested_date = True
-                    self.logger.info(f"Found date range for requested date {requested_date}: {start_str}")
-                    return True
-            
-            if not has_date_ranges_for_requested_date:
-                self.logger.warning(f"No date ranges found for requested date {requested_date}")
-                return False
-            
-            # Default to False if no ranges match
-            return False
+            is_available = datetime_str in self.build_availability_index(availability_result)
+            self.logger.info(f"Time {datetime_str} is available: {is_available}")
+            return is_available
             
         except Exception as e:
             self.logger.error(f"Error checking time availability: {str(e)}")
@@ -689,65 +942,70 @@ class CalAPIClient:
             Dictionary with the matching event type or error details
         """
         self.logger.info(f"Finding event type with duration {duration_minutes} minutes")
-        
+        return await self._cached_event_type_lookup(
+            f"event_type_by_duration:{duration_minutes}",
+            lambda: self._fetch_event_type_by_duration(duration_minutes)
+        )
+    
+    async def _fetch_event_type_by_duration(self, duration_minutes: int) -> Dict[str, Any]:
+        """Find the event type closest to duration_minutes, bypassing the cache."""
         try:
             # Get all event types first
             url = f"{self.api_url}/event-types"
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params={"apiKey": self.api_key}) as response:
-                    response_status = response.status
-                    response_text = await response.text()
+            async with self._request("GET", url, params={"apiKey": self.api_key}) as response:
+                response_status = response.status
+                response_text = await response.text()
+                
+                if response_status != 200:
+                    self.logger.error(f"Failed to get event types: HTTP {response_status}")
+                    return {
+                        "status": "error",
+                        "message": f"Failed to get event types: HTTP {response_status}",
+                        "details": response_text
+                    }
+                
+                try:
+                    data = json.loads(response_text)
+                    event_types = data.get("event_types", [])
                     
-                    if response_status != 200:
-                        self.logger.error(f"Failed to get event types: HTTP {response_status}")
-                        return {
-                            "status": "error",
-                            "message": f"Failed to get event types: HTTP {response_status}",
-                            "details": response_text
-                        }
+                    # Find an event type matching the requested duration
+                    matching_event_types = [et for et in event_types if et.get("length") == duration_minutes]
                     
-                    try:
-                        data = json.loads(response_text)
-                        event_types = data.get("event_types", [])
-                        
-                        # Find an event type matching the requested duration
-                        matching_event_types = [et for et in event_types if et.get("length") == duration_minutes]
-                        
-                        if matching_event_types:
-                            # Use the first matching event type
-                            event_type = matching_event_types[0]
-                            self.logger.info(f"Found matching event type: ID {event_type.get('id')}, title: {event_type.get('title')}")
-                            return {
-                                "status": "success",
-                                "event_type": event_type
-                            }
-                        
-                        # If no exact match, find the closest event type
-                        if not matching_event_types and event_types:
-                            # Sort by how close the duration is to requested
-                            event_types.sort(key=lambda et: abs(et.get("length", 0) - duration_minutes))
-                            closest_event_type = event_types[0]
-                            self.logger.info(f"No exact match found. Using closest event type: ID {closest_event_type.get('id')}, " 
-                                             f"title: {closest_event_type.get('title')}, duration: {closest_event_type.get('length')} minutes")
-                            return {
-                                "status": "success",
-                                "event_type": closest_event_type,
-                                "message": f"No exact {duration_minutes}-minute event type found. Using closest match: {closest_event_type.get('length')} minutes"
-                            }
-                        
+                    if matching_event_types:
+                        # Use the first matching event type
+                        event_type = matching_event_types[0]
+                        self.logger.info(f"Found matching event type: ID {event_type.get('id')}, title: {event_type.get('title')}")
                         return {
-                            "status": "error",
-                            "message": "No event types found"
+                            "status": "success",
+                            "event_type": event_type
                         }
-                        
-                    except json.JSONDecodeError:
-                        self.logger.error("Invalid JSON in event types response")
+                    
+                    # If no exact match, find the closest event type
+                    if not matching_event_types and event_types:
+                        # Sort by how close the duration is to requested
+                        event_types.sort(key=lambda et: abs(et.get("length", 0) - duration_minutes))
+                        closest_event_type = event_types[0]
+                        self.logger.info(f"No exact match found. Using closest event type: ID {closest_event_type.get('id')}, " 
+                                         f"title: {closest_event_type.get('title')}, duration: {closest_event_type.get('length')} minutes")
                         return {
-                            "status": "error",
-                            "message": "Invalid response from calendar service"
+                            "status": "success",
+                            "event_type": closest_event_type,
+                            "message": f"No exact {duration_minutes}-minute event type found. Using closest match: {closest_event_type.get('length')} minutes"
                         }
                     
+                    return {
+                        "status": "error",
+                        "message": "No event types found"
+                    }
+                    
+                except json.JSONDecodeError:
+                    self.logger.error("Invalid JSON in event types response")
+                    return {
+                        "status": "error",
+                        "message": "Invalid response from calendar service"
+                    }
+                
         except Exception as e:
             self.logger.error(f"Error finding event type: {str(e)}")
             return {
@@ -762,57 +1020,63 @@ class CalAPIClient:
         Returns:
             Dictionary containing available event types or error details
         """
+        return await self._cached_event_type_lookup(
+            "available_event_types", self._fetch_available_event_types
+        )
+    
+    async def _fetch_available_event_types(self) -> Dict[str, Any]:
+        """Fetch a simplified list of event types, bypassing the cache."""
         try:
             self.logger.info("Checking available event types")
             url = f"{self.api_url}/event-types"
             self.logger.info(f"URL: {url}")
             self.logger.info(f"API Key: {self.api_key}")
             
-            async with aiohttp.ClientSession() as session:
-                async with session.get(
-                    url, 
-                    params={"apiKey": self.api_key}
-                ) as response:
-                    response_status = response.status
-                    response_text = await response.text()
-                    self.logger.info(f"Event types response status: {response_status}")
-                    self.logger.info(f"Event types response: {response_text}")
+            async with self._request(
+                "GET",
+                url, 
+                params={"apiKey": self.api_key}
+            ) as response:
+                response_status = response.status
+                response_text = await response.text()
+                self.logger.info(f"Event types response status: {response_status}")
+                self.logger.info(f"Event types response: {response_text}")
+                
+                if response_status != 200:
+                    return {
+                        "status": "error",
+                        "message": f"Failed to get event types: HTTP {response_status}",
+                        "details": response_text,
+                        "http_code": response_status
+                    }
+                
+                try:
+                    response_data = json.loads(response_text)
+                    event_types = response_data.get("event_types", [])
                     
-                    if response_status != 200:
-                        return {
-                            "status": "error",
-                            "message": f"Failed to get event types: HTTP {response_status}",
-                            "details": response_text,
-                            "http_code": response_status
-                        }
-                    
-                    try:
-                        response_data = json.loads(response_text)
-                        event_types = response_data.get("event_types", [])
-                        
-                        # Extract key details about each event type
-                        simplified_event_types = []
-                        for et in event_types:
-                            simplified_event_types.append({
-                                "id": et.get("id"),
-                                "slug": et.get("slug"),
-                                "title": et.get("title"),
-                                "length": et.get("length"),
-                                "description": et.get("description"),
-                            })
-                        
-                        return {
-                            "status": "success",
-                            "event_types": simplified_event_types
-                        }
-                    except json.JSONDecodeError:
-                        return {
-                            "status": "error",
-                            "message": "Invalid JSON in API response",
-                            "details": response_text,
-                            "http_code": response_status
-                        }
+                    # Extract key details about each event type
+                    simplified_event_types = []
+                    for et in event_types:
+                        simplified_event_types.append({
+                            "id": et.get("id"),
+                            "slug": et.get("slug"),
+                            "title": et.get("title"),
+                            "length": et.get("length"),
+                            "description": et.get("description"),
+                        })
                     
+                    return {
+                        "status": "success",
+                        "event_types": simplified_event_types
+                    }
+                except json.JSONDecodeError:
+                    return {
+                        "status": "error",
+                        "message": "Invalid JSON in API response",
+                        "details": response_text,
+                        "http_code": response_status
+                    }
+                
         except Exception as e:
             self.logger.error(f"Error checking event types: {str(e)}")
             return {
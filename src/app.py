@@ -2,23 +2,38 @@
 Main application entry point for the Cal.com Scheduler Agent.
 """
 
+import asyncio
 import os
+import re
+import hmac
 import uuid
 import time
+from contextlib import asynccontextmanager
+import orjson
+from collections import OrderedDict, defaultdict
+from functools import lru_cache
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timezone
 from dotenv import load_dotenv
-from fastapi import FastAPI, HTTPException, Depends, Header, Query, Path, status
+from fastapi import FastAPI, HTTPException, Depends, Header, Query, Path, Request, status
+from fastapi.exceptions import RequestValidationError
 from fastapi.security.api_key import APIKeyHeader
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.docs import get_swagger_ui_html
+from fastapi.responses import ORJSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field, EmailStr
+from pydantic import BaseModel, ConfigDict, Field, EmailStr, ValidationError
 
 from src.bot.chatbot import CalendarAgent
 from src.utils.config import validate_config, logger, get_api_key
 from src.api.cal_api import CalAPIClient
 
+try:
+    import redis.asyncio as aioredis
+except ImportError:
+    # Redis is only needed when REDIS_URL is set
+    aioredis = None
+
 # Load environment variables
 load_dotenv()
 
@@ -26,6 +41,51 @@ load_dotenv()
 if not validate_config():
     logger.warning("Missing required environment variables. Some features may not work correctly.")
 
+_UTC = timezone.utc
+_dt_now = datetime.now
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO 8601 string."""
+    # isoformat() is C code and about twice as fast as an equivalent strftime pattern
+    return _dt_now(_UTC).isoformat()
+
+def _new_id() -> str:
+    """New random id (32 hex chars, no dashes)."""
+    return uuid.uuid4().hex
+
+def _orjson_default(obj):
+    """Serialize values orjson doesn't handle natively (datetime and UUID already are)."""
+    if isinstance(obj, BaseModel):
+        return obj.model_dump()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+class AppJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also knows how to serialize Pydantic models."""
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Set up the app's shared resources on startup and release them on shutdown."""
+    # Build the OpenAPI schema once at startup (FastAPI caches it on the app),
+    # so the first request to the docs doesn't pay for generating it
+    app.openapi()
+    # Single Cal.com API client for the whole app, so its connection pool is
+    # reused across requests
+    try:
+        app.state.cal_api = CalAPIClient()
+    except Exception as e:
+        logger.error(f"Failed to initialize CalAPIClient: {e}")
+        app.state.cal_api = None
+    try:
+        yield
+    finally:
+        if app.state.cal_api is not None:
+            await app.state.cal_api.cleanup()
+        await conversation_store.close()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Cal.com Scheduler Agent API",
@@ -51,6 +111,8 @@ app = FastAPI(
     license_info={
         "name": "MIT",
     },
+    default_response_class=AppJSONResponse,
+    lifespan=lifespan,
 )
 
 # Add CORS middleware
@@ -65,50 +127,77 @@ app.add_middleware(
 # API key security
 API_KEY_NAME = "X-API-Key"
 api_key_header = APIKeyHeader(name=API_KEY_NAME, auto_error=False)
-
-# In-memory storage for conversations (replace with database in production)
-conversations = {}
+# Read once at startup rather than on every request
+_VALID_API_KEY = os.getenv("API_KEY", "test-api-key").encode()
+
+# Schema examples for the API docs, built once at import time
+_CHAT_MESSAGE_EXAMPLE = {
+    "message": "Book a meeting for tomorrow at 3pm",
+    "user_email": "user@example.com",
+    "conversation_id": None
+}
+
+_CHAT_RESPONSE_EXAMPLE = {
+    "response": "I've booked a meeting for you tomorrow at 3pm. You'll receive an email confirmation shortly.",
+    "conversation_id": "550e8400e29b41d4a716446655440000",
+    "action_taken": "book_meeting",
+    "details": {
+        "meeting_id": "123456",
+        "start_time": "2023-03-02T15:00:00.000Z",
+        "end_time": "2023-03-02T16:00:00.000Z"
+    }
+}
+
+_NEW_CONVERSATION_EXAMPLE = {
+    "user_email": "user@example.com"
+}
+
+_AVAILABILITY_REQUEST_EXAMPLE = {
+    "event_type_id": "1",
+    "start_date": "2023-03-01",
+    "end_date": "2023-03-07"
+}
+
+_BOOK_EVENT_REQUEST_EXAMPLE = {
+    "event_type_id": "1",
+    "date": "2023-03-02",
+    "time": "15:00",
+    "name": "John Doe",
+    "email": "user@example.com",
+    "reason": "Discuss project requirements"
+}
+
+_RESCHEDULE_EVENT_REQUEST_EXAMPLE = {
+    "new_date": "2023-03-03",
+    "new_time": "14:00"
+}
 
 # Models
 class ChatMessage(BaseModel):
     """User message model."""
     message: str = Field(..., description="The message content to send to the chatbot", example="Can you book a meeting for me on Monday at 2pm?")
     user_email: EmailStr = Field(..., description="The email of the user sending the message", example="user@example.com")
-    conversation_id: Optional[str] = Field(None, description="Optional ID of an existing conversation", example="550e8400-e29b-41d4-a716-446655440000")
+    conversation_id: Optional[str] = Field(None, description="Optional ID of an existing conversation", example="550e8400e29b41d4a716446655440000")
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "message": "Book a meeting for tomorrow at 3pm",
-                "user_email": "user@example.com",
-                "conversation_id": None
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": _CHAT_MESSAGE_EXAMPLE})
 
 class Message(BaseModel):
     """Message model for conversation history."""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), description="Unique identifier for the message")
+    id: str = Field(default_factory=_new_id, description="Unique identifier for the message")
     content: str = Field(..., description="Content of the message")
     role: str = Field(..., description="Role of the message sender (user or assistant)")
-    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat(), description="Timestamp when the message was created")
-    
-    class Config:
-        schema_extra = {
-            "example": {
-                "id": "550e8400-e29b-41d4-a716-446655440000",
-                "content": "Book a meeting for tomorrow at 3pm",
-                "role": "user",
-                "created_at": "2023-03-01T14:00:00.000Z"
-            }
-        }
+    created_at: str = Field(default_factory=_now_iso, description="Timestamp when the message was created")
 
 class Conversation(BaseModel):
     """Conversation model."""
-    id: str = Field(default_factory=lambda: str(uuid.uuid4()), description="Unique identifier for the conversation")
-    user_email: EmailStr = Field(..., description="Email of the user owning the conversation")
-    messages: List[Message] = Field(default_factory=list, description="List of messages in the conversation")
-    created_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat(), description="Timestamp when the conversation was created")
-    updated_at: str = Field(default_factory=lambda: datetime.now(timezone.utc).isoformat(), description="Timestamp when the conversation was last updated")
+    id: str = Field(default_factory=_new_id, description="Unique identifier for the conversation")
+    # Already validated where it entered the API (ChatMessage/NewConversation)
+    user_email: str = Field(..., description="Email of the user owning the conversation")
+    # Stored as plain dicts shaped like Message so they serialize in one orjson call
+    messages: List[Dict[str, Any]] = Field(default_factory=list, description="List of messages in the conversation")
+    message_count: int = Field(0, description="Number of messages in the conversation")
+    created_at: str = Field(default_factory=_now_iso, description="Timestamp when the conversation was created")
+    updated_at: str = Field(default_factory=_now_iso, description="Timestamp when the conversation was last updated")
 
 class ChatResponse(BaseModel):
     """Response model for chat messages."""
@@ -117,30 +206,13 @@ class ChatResponse(BaseModel):
     action_taken: Optional[str] = Field(None, description="Action taken by the chatbot, if any")
     details: Optional[Dict[str, Any]] = Field(None, description="Additional details about the action taken")
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "response": "I've booked a meeting for you tomorrow at 3pm. You'll receive an email confirmation shortly.",
-                "conversation_id": "550e8400-e29b-41d4-a716-446655440000",
-                "action_taken": "book_meeting",
-                "details": {
-                    "meeting_id": "123456",
-                    "start_time": "2023-03-02T15:00:00.000Z",
-                    "end_time": "2023-03-02T16:00:00.000Z"
-                }
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": _CHAT_RESPONSE_EXAMPLE})
 
 class NewConversation(BaseModel):
     """Model for creating a new conversation."""
     user_email: EmailStr = Field(..., description="Email of the user creating the conversation", example="user@example.com")
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "user_email": "user@example.com"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": _NEW_CONVERSATION_EXAMPLE})
 
 class AvailabilityRequest(BaseModel):
     """Model for requesting available slots."""
@@ -148,14 +220,7 @@ class AvailabilityRequest(BaseModel):
     start_date: str = Field(..., description="Start date in YYYY-MM-DD format", example="2023-03-01")
     end_date: str = Field(..., description="End date in YYYY-MM-DD format", example="2023-03-07")
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "event_type_id": "1",
-                "start_date": "2023-03-01",
-                "end_date": "2023-03-07"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": _AVAILABILITY_REQUEST_EXAMPLE})
 
 class BookEventRequest(BaseModel):
     """Model for booking a new event."""
@@ -166,65 +231,310 @@ class BookEventRequest(BaseModel):
     email: EmailStr = Field(..., description="Email of the attendee", example="user@example.com")
     reason: Optional[str] = Field(None, description="Reason for the meeting", example="Discuss project requirements")
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "event_type_id": "1",
-                "date": "2023-03-02",
-                "time": "15:00",
-                "name": "John Doe",
-                "email": "user@example.com",
-                "reason": "Discuss project requirements"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": _BOOK_EVENT_REQUEST_EXAMPLE})
 
 class RescheduleEventRequest(BaseModel):
     """Model for rescheduling an event."""
     new_date: str = Field(..., description="New date in YYYY-MM-DD format", example="2023-03-03")
     new_time: str = Field(..., description="New time in HH:MM format", example="14:00")
     
-    class Config:
-        schema_extra = {
-            "example": {
-                "new_date": "2023-03-03",
-                "new_time": "14:00"
-            }
+    model_config = ConfigDict(json_schema_extra={"example": _RESCHEDULE_EVENT_REQUEST_EXAMPLE})
+
+# Conversation storage
+class InMemoryConversationStore:
+    """
+    Keeps conversations in a process-local dict (lost on restart, not shared between workers).
+
+    At most `max_conversations` are kept; the least recently used ones are
+    evicted first.
+    """
+
+    def __init__(self, max_conversations: int):
+        self.max_conversations = max_conversations
+        self.conversations = OrderedDict()
+        # user_email -> conversation ids, so filtered listing doesn't scan
+        # everything; dict keys keep them in creation order
+        self._by_user = defaultdict(dict)
+
+    async def create(self, conversation: Conversation) -> None:
+        self.conversations[conversation.id] = conversation
+        self._by_user[conversation.user_email][conversation.id] = None
+        while len(self.conversations) > self.max_conversations:
+            _, evicted = self.conversations.popitem(last=False)
+            self._unindex(evicted)
+
+    async def exists(self, conversation_id: str) -> bool:
+        return conversation_id in self.conversations
+
+    async def append_message(self, conversation_id: str, message: Dict[str, Any], updated_at: str) -> None:
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None:
+            # Evicted while the agent was answering (other conversations were
+            # created in the meantime); the turn still gets its reply
+            logger.warning(f"Conversation {conversation_id} was evicted, not storing message")
+            return
+        self.conversations.move_to_end(conversation_id)
+        conversation.messages.append(message)
+        conversation.message_count += 1
+        conversation.updated_at = updated_at
+
+    async def get_summary(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None:
+            return None
+        self.conversations.move_to_end(conversation_id)
+        return self._summary(conversation)
+
+    async def list_summaries(self, user_email: Optional[str] = None) -> List[Dict[str, Any]]:
+        if user_email is None:
+            return [self._summary(conversation) for conversation in self.conversations.values()]
+        return [
+            self._summary(self.conversations[conversation_id])
+            for conversation_id in self._by_user.get(user_email, ())
+        ]
+
+    async def get_messages(self, conversation_id: str) -> Optional[List[Any]]:
+        conversation = self.conversations.get(conversation_id)
+        if conversation is None:
+            return None
+        self.conversations.move_to_end(conversation_id)
+        return conversation.messages
+
+    async def delete(self, conversation_id: str) -> bool:
+        conversation = self.conversations.pop(conversation_id, None)
+        if conversation is None:
+            return False
+        self._unindex(conversation)
+        return True
+
+    async def close(self) -> None:
+        pass
+
+    def _unindex(self, conversation: Conversation) -> None:
+        user_ids = self._by_user[conversation.user_email]
+        user_ids.pop(conversation.id, None)
+        if not user_ids:
+            del self._by_user[conversation.user_email]
+
+    @staticmethod
+    def _summary(conversation: Conversation) -> Dict[str, Any]:
+        return {
+            "id": conversation.id,
+            "user_email": conversation.user_email,
+            "created_at": conversation.created_at,
+            "updated_at": conversation.updated_at,
+            "message_count": conversation.message_count
         }
 
+class RedisConversationStore:
+    """
+    Keeps conversations in Redis so they survive restarts and are shared by all workers.
+
+    Each conversation is a hash at conv:{id}:meta plus a list of orjson-encoded
+    messages at conv:{id}:msgs, and its id is added to the user's
+    user:{email}:convs set. Keys expire after `ttl` seconds without activity.
+    """
+
+    # Appends a message and refreshes every key of the conversation, including
+    # the owner's conversation set, in one atomic step. Does nothing (and
+    # returns 0) if the conversation has expired, so no orphan meta hash is
+    # left behind.
+    # KEYS: meta, msgs; ARGV: message, updated_at, ttl
+    _APPEND_SCRIPT = """
+    local user_email = redis.call('HGET', KEYS[1], 'user_email')
+    if not user_email then
+        return 0
+    end
+    local user_key = 'user:' .. user_email .. ':convs'
+    redis.call('RPUSH', KEYS[2], ARGV[1])
+    redis.call('HSET', KEYS[1], 'updated_at', ARGV[2])
+    redis.call('EXPIRE', KEYS[1], ARGV[3])
+    redis.call('EXPIRE', KEYS[2], ARGV[3])
+    redis.call('EXPIRE', user_key, ARGV[3])
+    return 1
+    """
+
+    def __init__(self, url: str, ttl: int):
+        self.redis = aioredis.Redis.from_url(url, decode_responses=True)
+        self.ttl = ttl
+        self._append = self.redis.register_script(self._APPEND_SCRIPT)
+
+    @staticmethod
+    def _meta_key(conversation_id: str) -> str:
+        return f"conv:{conversation_id}:meta"
+
+    @staticmethod
+    def _msgs_key(conversation_id: str) -> str:
+        return f"conv:{conversation_id}:msgs"
+
+    @staticmethod
+    def _user_key(user_email: str) -> str:
+        return f"user:{user_email}:convs"
+
+    async def create(self, conversation: Conversation) -> None:
+        meta_key = self._meta_key(conversation.id)
+        user_key = self._user_key(conversation.user_email)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(meta_key, mapping={
+                "id": conversation.id,
+                "user_email": conversation.user_email,
+                "created_at": conversation.created_at,
+                "updated_at": conversation.updated_at
+            })
+            pipe.expire(meta_key, self.ttl)
+            pipe.sadd(user_key, conversation.id)
+            pipe.expire(user_key, self.ttl)
+            await pipe.execute()
+
+    async def exists(self, conversation_id: str) -> bool:
+        return bool(await self.redis.exists(self._meta_key(conversation_id)))
+
+    async def append_message(self, conversation_id: str, message: Dict[str, Any], updated_at: str) -> None:
+        appended = await self._append(
+            keys=[self._meta_key(conversation_id), self._msgs_key(conversation_id)],
+            args=[orjson.dumps(message), updated_at, self.ttl],
+        )
+        if not appended:
+            logger.warning(f"Conversation {conversation_id} has expired, not storing message")
+
+    async def get_summary(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.hgetall(self._meta_key(conversation_id))
+            pipe.llen(self._msgs_key(conversation_id))
+            meta, message_count = await pipe.execute()
+        if not meta:
+            return None
+        return {**meta, "message_count": message_count}
+
+    async def list_summaries(self, user_email: Optional[str] = None) -> List[Dict[str, Any]]:
+        if user_email is None:
+            conversation_ids = [
+                meta_key.split(":")[1]
+                async for meta_key in self.redis.scan_iter(match="conv:*:meta")
+            ]
+        else:
+            conversation_ids = list(await self.redis.smembers(self._user_key(user_email)))
+        # Fetch every summary in a single round trip
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for conversation_id in conversation_ids:
+                pipe.hgetall(self._meta_key(conversation_id))
+                pipe.llen(self._msgs_key(conversation_id))
+            replies = await pipe.execute()
+        result = []
+        stale = []
+        for conversation_id, meta, message_count in zip(conversation_ids, replies[::2], replies[1::2]):
+            if not meta:
+                stale.append(conversation_id)
+            else:
+                result.append({**meta, "message_count": message_count})
+        if user_email is not None and stale:
+            # Drop ids of conversations that have since expired
+            await self.redis.srem(self._user_key(user_email), *stale)
+        # Sets are unordered; list in creation order like the in-memory store
+        result.sort(key=lambda summary: summary.get("created_at", ""))
+        return result
+
+    async def get_messages(self, conversation_id: str) -> Optional[List[Any]]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.exists(self._meta_key(conversation_id))
+            pipe.lrange(self._msgs_key(conversation_id), 0, -1)
+            found, messages = await pipe.execute()
+        if not found:
+            return None
+        return [orjson.loads(m) for m in messages]
+
+    async def delete(self, conversation_id: str) -> bool:
+        meta_key = self._meta_key(conversation_id)
+        user_email = await self.redis.hget(meta_key, "user_email")
+        if user_email is None:
+            return False
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.delete(meta_key, self._msgs_key(conversation_id))
+            pipe.srem(self._user_key(user_email), conversation_id)
+            await pipe.execute()
+        return True
+
+    async def close(self) -> None:
+        await self.redis.aclose()
+
+def _create_conversation_store():
+    """Use Redis when REDIS_URL is configured, otherwise fall back to process memory."""
+    redis_url = os.getenv("REDIS_URL")
+    if redis_url:
+        if aioredis is not None:
+            ttl = int(os.getenv("CONVERSATION_TTL", str(7 * 24 * 3600)))
+            logger.info("Storing conversations in Redis")
+            return RedisConversationStore(redis_url, ttl)
+        logger.warning("REDIS_URL is set but the redis package is not installed; storing conversations in memory")
+    return InMemoryConversationStore(int(os.getenv("MAX_CONVERSATIONS", "10000")))
+
+conversation_store = _create_conversation_store()
+
 # Helper functions
-def verify_api_key(api_key: str = Header(None, alias=API_KEY_NAME)):
+# Dependencies are async def so FastAPI runs them on the event loop instead
+# of handing each one to the threadpool. Anything doing real I/O here must
+# await it (e.g. through the shared httpx client), never block.
+async def get_store():
+    """Get the conversation store shared by all requests."""
+    return conversation_store
+
+async def verify_api_key(api_key: str = Header(None, alias=API_KEY_NAME)):
     """Verify the API key."""
     # In production, use a more secure approach for storing and validating API keys
-    valid_api_key = os.getenv("API_KEY", "test-api-key")
-    if api_key != valid_api_key:
+    if api_key is None or not hmac.compare_digest(api_key.encode(), _VALID_API_KEY):
         raise HTTPException(status_code=401, detail="Invalid API key")
     return api_key
 
-# Create a dependency to get the chatbot agent
-# Single shared instance for all requests
-_agent_instance = None
+def _json_body(model):
+    """
+    Dependency that validates the raw request body against `model`.
 
-def get_agent():
-    """Get or create a CalendarAgent instance as a singleton to maintain context."""
-    global _agent_instance
-    if _agent_instance is None:
+    model_validate_json parses and validates the bytes in a single
+    pydantic-core pass, skipping FastAPI's json.loads + dict validation.
+    """
+    async def parse(request: Request):
         try:
-            _agent_instance = CalendarAgent()
-            logger.info("Created singleton CalendarAgent instance")
-        except Exception as e:
-            logger.error(f"Failed to initialize CalendarAgent: {e}")
-            raise HTTPException(status_code=500, detail="Failed to initialize chatbot")
-    return _agent_instance
+            return model.model_validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+            )
+    return parse
+
+def _json_body_schema(model) -> Dict[str, Any]:
+    """OpenAPI request body for routes that read their body via _json_body."""
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": model.model_json_schema()}}
+        }
+    }
 
-# Create a dependency to get the Cal.com API client
-async def get_cal_api():
-    """Get or create a CalAPIClient instance."""
+# Create a dependency to get the chatbot agent
+# Single shared instance for all requests
+@lru_cache(maxsize=1)
+def _create_agent() -> CalendarAgent:
+    """Create the CalendarAgent once; failures are not cached, so the next request retries."""
+    agent = CalendarAgent()
+    logger.info("Created singleton CalendarAgent instance")
+    return agent
+
+async def get_agent() -> CalendarAgent:
+    """Get or create a CalendarAgent instance as a singleton to maintain context."""
     try:
-        client = CalAPIClient()
-        yield client
+        return _create_agent()
     except Exception as e:
-        logger.error(f"Failed to initialize CalAPIClient: {e}")
-        raise HTTPException(status_code=500, detail="Failed to initialize Cal.com API client")
+        logger.error(f"Failed to initialize CalendarAgent: {e}")
+        raise HTTPException(status_code=500, detail="Failed to initialize chatbot")
+
+# Create a dependency to get the Cal.com API client
+async def get_cal_api(request: Request) -> CalAPIClient:
+    """Get the shared CalAPIClient instance created in lifespan()."""
+    cal_api = getattr(request.app.state, "cal_api", None)
+    if cal_api is None:
+        # Startup hasn't run, or creating the client failed
+        raise HTTPException(status_code=503, detail="Cal.com API client is not available")
+    return cal_api
 
 # Custom Swagger UI route
 @app.get("/api/docs", include_in_schema=False)
@@ -242,11 +552,13 @@ async def root():
     """Root endpoint that returns a welcome message."""
     return {"message": "Welcome to Cal.com Scheduler Agent API", "documentation": "/api/docs"}
 
-@app.post("/chat", response_model=ChatResponse, tags=["Chat"])
+@app.post("/chat", responses={200: {"model": ChatResponse}}, tags=["Chat"], openapi_extra=_json_body_schema(ChatMessage))
 async def chat(
-    message: ChatMessage, 
+    # Listed first so a bad key is rejected before the body is parsed
+    api_key: str = Depends(verify_api_key),
+    message: ChatMessage = Depends(_json_body(ChatMessage)),
     agent: CalendarAgent = Depends(get_agent),
-    api_key: str = Depends(verify_api_key)
+    store = Depends(get_store)
 ):
     """
     Send a message to the chatbot and get a response.
@@ -260,26 +572,34 @@ async def chat(
     If you don't provide a conversation_id, a new conversation will be created.
     """
     try:
+        # One timestamp for the whole turn
+        now = _now_iso()
+        
         # Get or create conversation
         conversation_id = message.conversation_id
-        if not conversation_id or conversation_id not in conversations:
-            # Create new conversation
-            conversation = Conversation(user_email=message.user_email)
+        if not conversation_id or not await store.exists(conversation_id):
+            # Create new conversation (inputs were validated on ChatMessage,
+            # so skip re-validation)
+            conversation = Conversation.model_construct(
+                id=_new_id(),
+                user_email=message.user_email,
+                messages=[],
+                message_count=0,
+                created_at=now,
+                updated_at=now
+            )
             conversation_id = conversation.id
-            conversations[conversation_id] = conversation
+            await store.create(conversation)
             logger.info(f"Created new conversation: {conversation_id}")
-        else:
-            # Get existing conversation
-            conversation = conversations[conversation_id]
-            # Update conversation
-            conversation.updated_at = datetime.now(timezone.utc).isoformat()
             
         # Add user message to conversation
-        user_message = Message(
-            content=message.message,
-            role="user"
-        )
-        conversation.messages.append(user_message)
+        user_message = {
+            "id": _new_id(),
+            "content": message.message,
+            "role": "user",
+            "created_at": now
+        }
+        await store.append_message(conversation_id, user_message, now)
         
         # Process the message with our agent
         result = await agent.process_message(
@@ -288,29 +608,48 @@ async def chat(
         )
         
         # Add assistant message to conversation
-        assistant_message = Message(
-            content=result["response"],
-            role="assistant"
-        )
-        conversation.messages.append(assistant_message)
-        
-        # Update the conversation in our storage
-        conversations[conversation_id] = conversation
+        assistant_message = {
+            "id": _new_id(),
+            "content": result["response"],
+            "role": "assistant",
+            "created_at": now
+        }
+        await store.append_message(conversation_id, assistant_message, now)
         
-        return ChatResponse(
-            response=result["response"],
-            conversation_id=conversation_id,
-            action_taken=result["action_taken"],
-            details=result["details"]
-        )
+        return AppJSONResponse({
+            "response": result["response"],
+            "conversation_id": conversation_id,
+            "action_taken": result["action_taken"],
+            "details": result["details"]
+        })
     except Exception as e:
         logger.error(f"Error in chat endpoint: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 # Conversation Management Endpoints
-@app.get("/api/conversations", response_model=List[Dict[str, Any]], tags=["Conversations"])
+_STREAM_BATCH = 256
+
+async def _json_array_chunks(items: List[Any]):
+    """
+    Yield `items` as a JSON array, encoding _STREAM_BATCH items per chunk.
+
+    Control goes back to the event loop between batches, so encoding a long
+    list doesn't hold up other requests.
+    """
+    count = len(items)
+    yield b"["
+    for start in range(0, count, _STREAM_BATCH):
+        if start:
+            await asyncio.sleep(0)
+        batch = items[start:min(start + _STREAM_BATCH, count)]
+        chunk = b",".join(orjson.dumps(item, default=_orjson_default) for item in batch)
+        yield b"," + chunk if start else chunk
+    yield b"]"
+
+@app.get("/api/conversations", tags=["Conversations"])
 async def list_conversations(
     user_email: Optional[str] = Query(None, description="Filter conversations by user email"),
+    store = Depends(get_store),
     api_key: str = Depends(verify_api_key)
 ):
     """
@@ -323,17 +662,8 @@ async def list_conversations(
     - Message count
     """
     try:
-        result = []
-        for conv_id, conversation in conversations.items():
-            if user_email is None or conversation.user_email == user_email:
-                result.append({
-                    "id": conversation.id,
-                    "user_email": conversation.user_email,
-                    "created_at": conversation.created_at,
-                    "updated_at": conversation.updated_at,
-                    "message_count": len(conversation.messages)
-                })
-        return result
+        result = await store.list_summaries(user_email)
+        return AppJSONResponse(result)
     except Exception as e:
         logger.error(f"Error listing conversations: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -341,6 +671,7 @@ async def list_conversations(
 @app.post("/api/conversations", status_code=status.HTTP_201_CREATED, tags=["Conversations"])
 async def create_conversation(
     conversation: NewConversation,
+    store = Depends(get_store),
     api_key: str = Depends(verify_api_key)
 ):
     """
@@ -353,8 +684,16 @@ async def create_conversation(
     - Message count (initially 0)
     """
     try:
-        new_conversation = Conversation(user_email=conversation.user_email)
-        conversations[new_conversation.id] = new_conversation
+        now = _now_iso()
+        new_conversation = Conversation.model_construct(
+            id=_new_id(),
+            user_email=conversation.user_email,
+            messages=[],
+            message_count=0,
+            created_at=now,
+            updated_at=now
+        )
+        await store.create(new_conversation)
         logger.info(f"Created new conversation: {new_conversation.id}")
         return {
             "id": new_conversation.id,
@@ -369,6 +708,7 @@ async def create_conversation(
 @app.get("/api/conversations/{conversation_id}", tags=["Conversations"])
 async def get_conversation(
     conversation_id: str = Path(..., description="The ID of the conversation to retrieve"),
+    store = Depends(get_store),
     api_key: str = Depends(verify_api_key)
 ):
     """
@@ -382,21 +722,16 @@ async def get_conversation(
     
     Raises a 404 error if the conversation is not found.
     """
-    if conversation_id not in conversations:
+    summary = await store.get_summary(conversation_id)
+    if summary is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
-    conversation = conversations[conversation_id]
-    return {
-        "id": conversation.id,
-        "user_email": conversation.user_email,
-        "created_at": conversation.created_at,
-        "updated_at": conversation.updated_at,
-        "message_count": len(conversation.messages)
-    }
+    return AppJSONResponse(summary)
 
 @app.delete("/api/conversations/{conversation_id}", tags=["Conversations"])
 async def delete_conversation(
     conversation_id: str = Path(..., description="The ID of the conversation to delete"),
+    store = Depends(get_store),
     api_key: str = Depends(verify_api_key)
 ):
     """
@@ -406,15 +741,15 @@ async def delete_conversation(
     
     Raises a 404 error if the conversation is not found.
     """
-    if conversation_id not in conversations:
+    if not await store.delete(conversation_id):
         raise HTTPException(status_code=404, detail="Conversation not found")
     
-    del conversations[conversation_id]
     return {"message": f"Conversation {conversation_id} deleted"}
 
-@app.get("/api/conversations/{conversation_id}/messages", tags=["Conversations"])
+@app.get("/api/conversations/{conversation_id}/messages", responses={200: {"model": List[Message]}}, tags=["Conversations"])
 async def get_conversation_messages(
     conversation_id: str = Path(..., description="The ID of the conversation"),
+    store = Depends(get_store),
     api_key: str = Depends(verify_api_key)
 ):
     """
@@ -428,11 +763,15 @@ async def get_conversation_messages(
     
     Raises a 404 error if the conversation is not found.
     """
-    if conversation_id not in conversations:
+    messages = await store.get_messages(conversation_id)
+    if messages is None:
         raise HTTPException(status_code=404, detail="Conversation not found")
     
-    conversation = conversations[conversation_id]
-    return conversation.messages
+    if len(messages) <= _STREAM_BATCH:
+        return AppJSONResponse(messages)
+    # Long histories are streamed so the event loop isn't blocked encoding
+    # one big buffer
+    return StreamingResponse(_json_array_chunks(messages), media_type="application/json")
 
 # Calendar API Endpoints
 @app.get("/api/calendar/availability", tags=["Calendar"])
@@ -458,16 +797,30 @@ async def get_availability(
     print("end_date:", end_date)
     try:
         slots = await cal_api.get_available_slots(event_type_id, start_date, end_date)
-        return slots
+        return AppJSONResponse(slots)
     except Exception as e:
         logger.error(f"Error getting available slots: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/api/calendar/events", status_code=status.HTTP_201_CREATED, tags=["Calendar"])
+# Cal.com booking errors -> (status code, client-facing detail), first match wins
+_BOOKING_ERRORS = [
+    (re.compile(r"(?=.*\b500\b)(?=.*database)", re.I | re.S),
+     (status.HTTP_503_SERVICE_UNAVAILABLE, "Calendar service is temporarily unavailable. Please try again later.")),
+    (re.compile(r"\b404\b"),
+     (status.HTTP_404_NOT_FOUND, "The requested event type could not be found.")),
+    (re.compile(r"\b40[13]\b"),
+     (status.HTTP_401_UNAUTHORIZED, "Authentication error with calendar service.")),
+    (re.compile(r"Invalid time slot"),
+     (status.HTTP_400_BAD_REQUEST, "The requested time slot is not available.")),
+]
+
+@app.post("/api/calendar/events", status_code=status.HTTP_201_CREATED, tags=["Calendar"],
+          openapi_extra=_json_body_schema(BookEventRequest))
 async def book_event(
-    event: BookEventRequest,
-    cal_api: CalAPIClient = Depends(get_cal_api),
-    api_key: str = Depends(verify_api_key)
+    # Listed first so a bad key is rejected before the body is parsed
+    api_key: str = Depends(verify_api_key),
+    event: BookEventRequest = Depends(_json_body(BookEventRequest)),
+    cal_api: CalAPIClient = Depends(get_cal_api)
 ):
     """
     Book a new event on the calendar.
@@ -495,23 +848,12 @@ async def book_event(
         
         if booking_result.get("status") == "error":
             error_message = booking_result.get("message", "Failed to book event")
-            status_code = status.HTTP_400_BAD_REQUEST
             
             # Handle different error types with appropriate status codes
-            if "500" in error_message and "database" in error_message.lower():
-                status_code = status.HTTP_503_SERVICE_UNAVAILABLE
-                error_detail = "Calendar service is temporarily unavailable. Please try again later."
-            elif "404" in error_message:
-                status_code = status.HTTP_404_NOT_FOUND
-                error_detail = "The requested event type could not be found."
-            elif "401" in error_message or "403" in error_message:
-                status_code = status.HTTP_401_UNAUTHORIZED
-                error_detail = "Authentication error with calendar service."
-            elif "Invalid time slot" in error_message:
-                status_code = status.HTTP_400_BAD_REQUEST
-                error_detail = "The requested time slot is not available."
-            else:
-                error_detail = error_message
+            status_code, error_detail = next(
+                (mapped for pattern, mapped in _BOOKING_ERRORS if pattern.search(error_message)),
+                (status.HTTP_400_BAD_REQUEST, error_message)
+            )
                 
             raise HTTPException(status_code=status_code, detail=error_detail)
         
@@ -540,7 +882,7 @@ async def list_events(
     """
     try:
         events = await cal_api.list_bookings(user_email)
-        return events
+        return AppJSONResponse(events)
     except Exception as e:
         logger.error(f"Error listing events: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -602,7 +944,21 @@ async def reschedule_event(
         raise HTTPException(status_code=500, detail=str(e))
 
 if __name__ == "__main__":
+    import importlib.util
     import uvicorn
     host = os.getenv("APP_HOST", "0.0.0.0")
     port = int(os.getenv("APP_PORT", "8000"))
-    uvicorn.run("src.app:app", host=host, port=port, reload=True) 
\ No newline at end of file
+    # uvloop and httptools are much faster than the asyncio loop and h11
+    # parser; fall back where they aren't installed (uvloop has no Windows build)
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    if os.getenv("APP_RELOAD") == "1":
+        # Development: single process that restarts on code changes
+        uvicorn.run("src.app:app", host=host, port=port, loop=loop, http=http, reload=True)
+    else:
+        # One event loop per CPU core (2n+1 to cover time spent waiting on
+        # OpenAI/Cal.com). In-memory conversations are per process, so only
+        # run several workers by default when they share Redis
+        default_workers = 2 * (os.cpu_count() or 1) + 1 if os.getenv("REDIS_URL") else 1
+        workers = int(os.getenv("WEB_CONCURRENCY", str(default_workers)))
+        uvicorn.run("src.app:app", host=host, port=port, loop=loop, http=http, workers=workers) 
\ No newline at end of file
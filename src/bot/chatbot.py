@@ -5,9 +5,9 @@ This module will handle the OpenAI function calling and conversation management.
 
 import json
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple, Union
 import asyncio
-from datetime import datetime, timedelta
+from datetime import date as date_type, datetime, timedelta
 import re
 import traceback
 import uuid
@@ -16,6 +16,65 @@ from src.utils.config import OPENAI_API_KEY, OPENAI_MODEL, logger
 from src.bot.openai_integration import OpenAIFunctionCaller, INTENTS
 from src.api.cal_api import CalAPIClient
 
+# Hours to add to a local time in each supported timezone to get UTC. These
+# are all fixed offsets; the bare "PT" and "ET" are treated as standard time.
+_TIMEZONE_OFFSETS = {
+    "PST": 8, "PDT": 7, "PT": 8,
+    "EST": 5, "EDT": 4, "ET": 5,
+    "GMT": 0, "UTC": 0,
+}
+_TIMEZONE_ABBR_RE = re.compile(r' (' + '|'.join(_TIMEZONE_OFFSETS) + r')')
+
+# Phrases asking for the earliest open slot, matched in one pass
+_EARLIEST_REQUEST_RE = re.compile(r'earliest|soonest|first available|next available', re.IGNORECASE)
+
+# Plain availability questions ("What times are available tomorrow?"); with
+# an explicit date these are answered from Cal.com without calling the LLM.
+# Only a message that is that one question qualifies, and anything mentioning
+# a booking change still goes to the LLM.
+_AVAILABILITY_QUESTION_RE = re.compile(
+    r'^\s*(?:what|which)\b[^.?!]*\b(?:times?|slots?)\b[^.?!]*\bavailable\b[^.?!]*\??\s*$',
+    re.IGNORECASE,
+)
+_BOOKING_CHANGE_RE = re.compile(r'\b(?:book|schedule|cancel|reschedule|move)\b', re.IGNORECASE)
+
+# How many slots to list when answering an availability question directly
+_LISTED_SLOTS = 5
+
+# Common clock times ("9:00 AM", "9am", "14:30", "0900") are parsed with a
+# single regex match; anything else falls through to the step-by-step parsing
+# in book_meeting. A missing colon before the minutes marks a 24-hour "0900"
+# style time.
+_CLOCK_TIME_RE = re.compile(
+    r'^(?P<h>\d{1,2})(?:(?P<sep>:)?(?P<m>\d{2}))?\s*(?P<ap>[ap]m)?$',
+    re.IGNORECASE,
+)
+
+
+def _parse_clock_time(value: str) -> Optional[Tuple[int, int, bool]]:
+    """
+    Parse a clock time with its timezone already removed.
+    
+    Returns:
+        (hours, minutes, is_pm) with hours as written (12-hour times are not yet
+        converted), or None if the format isn't recognized
+    """
+    match = _CLOCK_TIME_RE.match(value.strip())
+    if not match:
+        return None
+    hours = int(match.group("h"))
+    minutes = int(match.group("m") or 0)
+    if hours > 23 or minutes > 59:
+        return None
+    meridiem = match.group("ap")
+    if meridiem:
+        is_pm = meridiem.lower() == "pm"
+    else:
+        # 24-hour clock without a colon: flag afternoon hours so 12xx isn't
+        # read as 12 AM
+        is_pm = match.group("m") is not None and match.group("sep") is None and hours >= 12
+    return hours, minutes, is_pm
+
 class CalendarAgent:
     """
     Calendar Agent handles conversation with users and uses OpenAI's function
@@ -70,8 +129,17 @@ class CalendarAgent:
     
     async def cleanup(self):
         """Clean up resources when the agent is no longer needed."""
-        if self.cal_api and hasattr(self.cal_api, 'client') and self.cal_api.client:
-            await self.cal_api.client.aclose()
+        if self.cal_api:
+            await self.cal_api.cleanup()
+    
+    async def __aenter__(self):
+        """Support for async context manager; initializes the agent."""
+        await self.initialize()
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Clean up resources when exiting context."""
+        await self.cleanup()
     
     def _add_system_message_if_needed(self):
         """Add a system message to the conversation if one isn't present."""
@@ -170,9 +238,11 @@ Maintain context throughout the conversation and refer back to previous messages
         self.conversation_history.append({"role": "user", "content": message})
         
         # Check if message contains a request for earliest available time
-        earliest_time_request = any(phrase in message.lower() for phrase in [
-            "earliest", "soonest", "first available", "next available"
-        ])
+        earliest_time_request = _EARLIEST_REQUEST_RE.search(message) is not None
+        availability_question = (
+            _AVAILABILITY_QUESTION_RE.match(message) is not None
+            and _BOOKING_CHANGE_RE.search(message) is None
+        )
         
         # Parse date and duration from the message if it's a request for availability
         target_date = None
@@ -196,7 +266,7 @@ Maintain context throughout the conversation and refer back to previous messages
                 if pattern == r'tomorrow':
                     # Calculate tomorrow's date
                     tomorrow = datetime.now() + timedelta(days=1)
-                    target_date = tomorrow.strftime("%Y-%m-%d")
+                    target_date = tomorrow.date().isoformat()
                 elif 'day' in pattern and 'May' not in pattern:  # New pattern for "Monday, May 19, 2025"
                     month_name = match.group(1)
                     day = int(match.group(2))
@@ -242,10 +312,13 @@ Maintain context throughout the conversation and refer back to previous messages
                         target_date = f"{year}-{month:02d}-{day:02d}"
                 break
         
+        # Availability questions are only answered directly for a date the user named
+        explicit_date = target_date is not None
+        
         # Default to tomorrow if no date found
         if not target_date:
             tomorrow = datetime.now() + timedelta(days=1)
-            target_date = tomorrow.strftime("%Y-%m-%d")
+            target_date = tomorrow.date().isoformat()
         
         # Check for duration in the message
         duration_patterns = [
@@ -271,8 +344,9 @@ Maintain context throughout the conversation and refer back to previous messages
         else:
             duration = 60
         
-        # Check if this is a request for finding earliest availability
-        if earliest_time_request and target_date:
+        # Requests for the earliest slot, or for the open times on a named
+        # date, are answered straight from Cal.com
+        if (earliest_time_request or (availability_question and explicit_date)) and target_date:
             self.logger.info(f"Getting available slots for event type from {target_date} to with duration {duration} minutes")
             
             # Get available slots for the target date
@@ -288,7 +362,13 @@ Maintain context throughout the conversation and refer back to previous messages
                 earliest_display = earliest_slot.get("display")
                 earliest_iso = earliest_slot.get("iso")
                 
-                response_text = f"The earliest available {duration}-minute slot on {target_date} is {earliest_display}. Would you like to book this time?"
+                if earliest_time_request:
+                    response_text = f"The earliest available {duration}-minute slot on {target_date} is {earliest_display}. Would you like to book this time?"
+                else:
+                    slots = result.get("available_slots")
+                    listed = "\n".join(f"- {slot.get('display')}" for slot in slots[:_LISTED_SLOTS])
+                    more = f"\n...and {len(slots) - _LISTED_SLOTS} more." if len(slots) > _LISTED_SLOTS else ""
+                    response_text = f"Found {len(slots)} available {duration}-minute slots on {target_date}:\n{listed}{more}\nWhich time would you like to book?"
             
                 self.conversation_history.append({
                     "role": "assistant",
@@ -431,14 +511,16 @@ Maintain context throughout the conversation and refer back to previous messages
         if not date_str:
             # Default to today if no date provided
             today = datetime.now()
-            date_str = today.strftime("%Y-%m-%d")
+            date_str = today.date().isoformat()
             
         self.logger.info(f"Getting available slots for date {date_str} with duration {duration} minutes")
         self.logger.debug(f"DEBUG: get_available_slots called with date_str={date_str}, duration={duration}, span_days={span_days}, earliest={earliest}")
         
         try:
-            # Initialize Cal.com API client
-            cal_api = CalAPIClient()
+            # Reuse the agent's Cal.com API client and its connection pool
+            if not self.cal_api:
+                await self.initialize()
+            cal_api = self.cal_api
             
             # First, find an appropriate event type based on duration
             self.logger.debug(f"DEBUG: Finding event type for duration {duration} minutes")
@@ -464,7 +546,8 @@ Maintain context throughout the conversation and refer back to previous messages
             if actual_duration != duration:
                 self.logger.info(f"Note: Using {actual_duration}-minute event type instead of requested {duration}-minute")
             
-            # Get availability from Cal.com API
+            # Get availability from Cal.com API (recent lookups are cached by the
+            # client and dropped whenever a booking changes)
             self.logger.debug(f"DEBUG: Getting availability for event type {event_type_id}, date {date_str}")
             availability_response = await cal_api.get_availability(event_type_id, date_str)
             self.logger.debug(f"DEBUG: Availability response: {json.dumps(availability_response)}")
@@ -588,12 +671,12 @@ Maintain context throughout the conversation and refer back to previous messages
                 "available_slots": []
             }
     
-    async def book_meeting(self, date: str, time: str, event_type_id: str = None, name: str = "Anonymous User", reason: str = "Not specified", duration: int = 30, skip_availability_check: bool = True) -> Dict[str, Any]:
+    async def book_meeting(self, date: Union[str, date_type], time: str, event_type_id: str = None, name: str = "Anonymous User", reason: str = "Not specified", duration: int = 30, skip_availability_check: bool = True) -> Dict[str, Any]:
         """
         Book a meeting at the specified date and time with a reason.
         
         Args:
-            date: The date for the meeting (YYYY-MM-DD)
+            date: The date for the meeting (YYYY-MM-DD string or datetime.date)
             time: The time for the meeting (HH:MM)
             event_type_id: Optional ID of the event type to book (if not provided, will find by duration)
             name: The name of the attendee (defaults to "Anonymous User")
@@ -604,6 +687,10 @@ Maintain context throughout the conversation and refer back to previous messages
         Returns:
             A dictionary with booking details or error information
         """
+        # A date object is already validated; use its ISO form directly
+        if isinstance(date, date_type):
+            date = date.isoformat()
+        
         self.logger.info(f"Booking meeting on {date} at {time} for reason: {reason}")
         self.logger.debug(f"DEBUG: book_meeting called with date={date}, time={time}, event_type_id={event_type_id}, name={name}, reason={reason}, duration={duration}, skip_availability_check={skip_availability_check}")
         
@@ -630,26 +717,11 @@ Maintain context throughout the conversation and refer back to previous messages
                 timezone_offset = 0  # Default to UTC
                 
                 # Extract timezone if present and remove from time string
-                if " PST" in cleaned_time or " PT" in cleaned_time:
-                    # Pacific Time (UTC-8)
-                    timezone_offset = 8  # Positive because we're adding hours to convert to UTC
-                    cleaned_time = cleaned_time.replace(" PST", "").replace(" PT", "")
-                    self.logger.info(f"Detected PST timezone, will add {timezone_offset} hours to convert to UTC")
-                elif " EST" in cleaned_time or " ET" in cleaned_time:
-                    # Eastern Time (UTC-5)
-                    timezone_offset = 5  # Positive because we're adding hours to convert to UTC
-                    cleaned_time = cleaned_time.replace(" EST", "").replace(" ET", "")
-                    self.logger.info(f"Detected EST timezone, will add {timezone_offset} hours to convert to UTC")
-                elif " GMT" in cleaned_time:
-                    # GMT (UTC+0)
-                    timezone_offset = 0
-                    cleaned_time = cleaned_time.replace(" GMT", "")
-                    self.logger.info("Detected GMT timezone, no conversion needed")
-                elif " UTC" in cleaned_time:
-                    # UTC (UTC+0)
-                    timezone_offset = 0
-                    cleaned_time = cleaned_time.replace(" UTC", "")
-                    self.logger.info("Detected UTC timezone, no conversion needed")
+                tz_match = _TIMEZONE_ABBR_RE.search(cleaned_time)
+                if tz_match:
+                    timezone_offset = _TIMEZONE_OFFSETS[tz_match.group(1)]
+                    cleaned_time = _TIMEZONE_ABBR_RE.sub("", cleaned_time)
+                    self.logger.info(f"Detected {tz_match.group(1)} timezone, will add {timezone_offset} hours to convert to UTC")
                 else:
                     # No timezone specified, default to PST (most likely user's local time)
                     timezone_offset = 8  # Positive because we're adding hours to convert to UTC
@@ -659,40 +731,44 @@ Maintain context throughout the conversation and refer back to previous messages
                 
                 # Format date and time as ISO 8601 with UTC timezone
                 try:
-                    # Normalize time to 24-hour format if needed
-                    is_pm = False
-                    if "am" in cleaned_time.lower():
-                        cleaned_time = cleaned_time.lower().replace("am", "").strip()
-                    elif "pm" in cleaned_time.lower():
-                        cleaned_time = cleaned_time.lower().replace("pm", "").strip()
-                        is_pm = True
-                    
-                    # Handle missing colon
-                    if ":" not in cleaned_time and cleaned_time.strip().isdigit():
-                        # No colon and just a number, assume it's hour only
-                        cleaned_time = f"{cleaned_time}:00"
-                    
-                    # Split the time into hours and minutes
-                    if ":" in cleaned_time:
-                        hours, minutes = cleaned_time.split(":")
-                        hours = int(hours)
-                        minutes = minutes.strip()
-                        if minutes.isdigit():
-                            minutes = int(minutes)
-                        else:
-                            minutes = 0
+                    parsed_time = _parse_clock_time(cleaned_time)
+                    if parsed_time is not None:
+                        hours, minutes, is_pm = parsed_time
                     else:
-                        # Best effort parsing for unusual formats
-                        try:
-                            hours = int(cleaned_time)
-                            minutes = 0
-                        except ValueError:
-                            return {
-                                "action": "book_meeting",
-                                "status": "error",
-                                "message": f"Could not parse time format: '{time}'. Please use a standard format like '3:00 PM'."
-                            }
-                    
+                        # Normalize time to 24-hour format if needed
+                        is_pm = False
+                        if "am" in cleaned_time.lower():
+                            cleaned_time = cleaned_time.lower().replace("am", "").strip()
+                        elif "pm" in cleaned_time.lower():
+                            cleaned_time = cleaned_time.lower().replace("pm", "").strip()
+                            is_pm = True
+                        
+                        # Handle missing colon
+                        if ":" not in cleaned_time and cleaned_time.strip().isdigit():
+                            # No colon and just a number, assume it's hour only
+                            cleaned_time = f"{cleaned_time}:00"
+                        
+                        # Split the time into hours and minutes
+                        if ":" in cleaned_time:
+                            hours, minutes = cleaned_time.split(":")
+                            hours = int(hours)
+                            minutes = minutes.strip()
+                            if minutes.isdigit():
+                                minutes = int(minutes)
+                            else:
+                                minutes = 0
+                        else:
+                            # Best effort parsing for unusual formats
+                            try:
+                                hours = int(cleaned_time)
+                                minutes = 0
+                            except ValueError:
+                                return {
+                                    "action": "book_meeting",
+                                    "status": "error",
+                                    "message": f"Could not parse time format: '{time}'. Please use a standard format like '3:00 PM'."
+                                }
+                        
                     # Adjust hours for PM
                     if is_pm and hours < 12:
                         hours += 12
@@ -31,12 +31,12 @@ def extract_natural_language_datetime(message: str):
     if re.search(tomorrow_pattern, message, re.IGNORECASE):
         # Calculate tomorrow's date
         tomorrow = datetime.now() + timedelta(days=1)
-        date_str = tomorrow.strftime("%Y-%m-%d")
+        date_str = tomorrow.date().isoformat()
         date_match = date_str
         logger.debug(f"Found 'tomorrow', set date to {date_match}")
     elif re.search(today_pattern, message, re.IGNORECASE):
         # Calculate today's date
-        date_str = datetime.now().strftime("%Y-%m-%d")
+        date_str = datetime.now().date().isoformat()
         date_match = date_str
         logger.debug(f"Found 'today', set date to {date_match}")
     
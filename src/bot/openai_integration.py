@@ -9,7 +9,7 @@ from typing import Dict, Any, List, Optional, Callable, Tuple, Union
 import asyncio
 import traceback
 import pytz  # For timezone handling
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 
 from langchain import LLMChain
 from langchain.llms import BaseLLM
@@ -35,6 +35,29 @@ INTENTS = {
     "UNKNOWN": "unknown_intent"
 }
 
+# Time patterns used by _is_simple_time_response / _normalize_time_format,
+# compiled once at import rather than looked up in re's cache on every call
+_SIMPLE_TIME_RES = (
+    re.compile(r'^(\d{1,2})[\\.:]?(\d{2})?(\s*[ap]m)?$'),  # 3pm, 3:00, 15:00
+    re.compile(r'^(at\s+)?(\d{1,2})(\s*[ap]m)$'),         # at 3pm
+    re.compile(r'^(morning|afternoon|evening)$'),         # afternoon
+    re.compile(r'^\s*(yes|sure|okay|ok|fine|good|excellent)\s+(\d{1,2})[\\.:]?(\d{2})?(\s*[ap]m)?\s*$'),  # yes 3pm
+)
+_TIMEZONE_SUFFIX_RE = re.compile(r' (?:pst|est|cst|mst|gmt|utc)')
+_AM_PM_RE = re.compile(r'(\d{1,2})(?::(\d{2}))?\s*(am|pm)')
+_HH_MM_RE = re.compile(r'^(\d{1,2}):(\d{2})$')
+_HOUR_AM_PM_RE = re.compile(r'^(\d{1,2})\s*(am|pm)$')
+_MILITARY_RE = re.compile(r'^(\d{3,4})$')
+_HOUR_ONLY_RE = re.compile(r'^(\d{1,2})$')
+# ISO 8601 datetime as emitted by the bot (e.g., 2025-05-14T20:30:00.000Z)
+_ISO_DATETIME_RE = re.compile(r'(\d{4}-\d{2}-\d{2})T(\d{2}:\d{2}):00\.000Z')
+# Explicit numeric dates: 2025-05-15, 2025 5/15 and 05/15/2025
+_EXPLICIT_DATE_RE = re.compile(
+    r'(?<!\d)(?:(\d{4})-(\d{1,2})-(\d{1,2})'
+    r'|(\d{4})\s+(\d{1,2})/(\d{1,2})'
+    r'|(\d{1,2})/(\d{1,2})/(\d{4}))(?!\d)'
+)
+
 # Monkey patch LLMChain to properly handle coroutines
 original_call = LLMChain._call
 async def patched_call(self, inputs, run_manager=None):
@@ -283,11 +306,11 @@ class OpenAIFunctionCaller:
                     if i >= 5:  # Only check last 5 messages
                         break
                     if msg["role"] == "user":
-                        hist_dt_params = await self._extract_datetime_with_llm(msg["content"])
-                        if hist_dt_params and "date" in hist_dt_params:
-                            booking_params["date"] = hist_dt_params["date"]
+                        hist_date = await self._extract_date(msg["content"])
+                        if hist_date:
+                            booking_params["date"] = hist_date
                             booking_params["time"] = message.strip()  # Use current message as time
-                            self._logger.info(f"Using date {hist_dt_params['date']} from conversation history with time {message}")
+                            self._logger.info(f"Using date {hist_date} from conversation history with time {message}")
                             break
             
             # If we have date and time from either extraction method, process directly
@@ -637,9 +660,9 @@ class OpenAIFunctionCaller:
             get_available_slots_func = functions.get("check_availability")
             if get_available_slots_func:
                 try:
-                    # First, try to extract date/time using LLM for the current message
-                    dt_params = await self._extract_datetime_with_llm(message)
-                    date_param = dt_params.get("date")
+                    # First, try to extract the date from the current message
+                    # (explicit numeric dates are parsed directly, the rest by the LLM)
+                    date_param = await self._extract_date(message)
                     
                     # If LLM didn't find a date, try ISO format as fallback
                     if not date_param:
@@ -653,9 +676,9 @@ class OpenAIFunctionCaller:
                             if i >= 5:  # Only check last 5 messages
                                 break
                             if msg["role"] == "user":
-                                hist_dt_params = await self._extract_datetime_with_llm(msg["content"])
-                                if hist_dt_params and "date" in hist_dt_params:
-                                    date_param = hist_dt_params["date"]
+                                hist_date = await self._extract_date(msg["content"])
+                                if hist_date:
+                                    date_param = hist_date
                                     break
                     
                     # If no date found or specified, default to today
@@ -948,12 +971,7 @@ class OpenAIFunctionCaller:
         message = message.lower().strip()
         
         # Check for simple time formats
-        return bool(
-            re.match(r'^(\d{1,2})[\\.:]?(\d{2})?(\s*[ap]m)?$', message) or  # 3pm, 3:00, 15:00
-            re.match(r'^(at\s+)?(\d{1,2})(\s*[ap]m)$', message) or         # at 3pm
-            re.match(r'^(morning|afternoon|evening)$', message) or         # afternoon
-            re.match(r'^\s*(yes|sure|okay|ok|fine|good|excellent)\s+(\d{1,2})[\\.:]?(\d{2})?(\s*[ap]m)?\s*$', message)  # yes 3pm
-        )
+        return any(pattern.match(message) for pattern in _SIMPLE_TIME_RES)
     
     def _normalize_time_format(self, time_str: str) -> str:
         """
@@ -979,10 +997,7 @@ class OpenAIFunctionCaller:
             return "18:00"
         
         # Remove timezone indicators
-        timezone_indicators = ["pst", "est", "cst", "mst", "gmt", "utc"]
-        for tz in timezone_indicators:
-            if f" {tz}" in time_str:
-                time_str = time_str.replace(f" {tz}", "")
+        time_str = _TIMEZONE_SUFFIX_RE.sub("", time_str)
         
         # Remove "at " prefix if present
         if time_str.startswith("at "):
@@ -992,7 +1007,7 @@ class OpenAIFunctionCaller:
         time_str = time_str.replace(" at ", " ").strip()
         
         # Try to parse various time formats
-        am_pm_match = re.search(r'(\d{1,2})(?::(\d{2}))?\s*(am|pm)', time_str)
+        am_pm_match = _AM_PM_RE.search(time_str)
         if am_pm_match:
             hour = int(am_pm_match.group(1))
             minute = int(am_pm_match.group(2) or "0")
@@ -1007,14 +1022,14 @@ class OpenAIFunctionCaller:
             return f"{hour:02d}:{minute:02d}"
         
         # Check if it's already in HH:MM format
-        time_match = re.match(r'^(\d{1,2}):(\d{2})$', time_str)
+        time_match = _HH_MM_RE.match(time_str)
         if time_match:
             hour = int(time_match.group(1))
             minute = int(time_match.group(2))
             return f"{hour:02d}:{minute:02d}"
         
         # Handle just hours with am/pm
-        hour_match = re.match(r'^(\d{1,2})\s*(am|pm)$', time_str)
+        hour_match = _HOUR_AM_PM_RE.match(time_str)
         if hour_match:
             hour = int(hour_match.group(1))
             am_pm = hour_match.group(2).lower()
@@ -1028,7 +1043,7 @@ class OpenAIFunctionCaller:
             return f"{hour:02d}:00"
         
         # Handle military time without colon
-        military_match = re.match(r'^(\d{3,4})$', time_str)
+        military_match = _MILITARY_RE.match(time_str)
         if military_match:
             time_digits = military_match.group(1)
             if len(time_digits) == 3:
@@ -1041,7 +1056,7 @@ class OpenAIFunctionCaller:
                 return f"{hour:02d}:{minute:02d}"
         
         # Just a number (assume it's an hour)
-        hour_only_match = re.match(r'^(\d{1,2})$', time_str)
+        hour_only_match = _HOUR_ONLY_RE.match(time_str)
         if hour_only_match:
             hour = int(hour_only_match.group(1))
             # If it's just a number between 1-12, assume it's PM unless it's 12
@@ -1269,9 +1284,7 @@ class OpenAIFunctionCaller:
         Returns:
             A dictionary with date and time if found, otherwise empty dict
         """
-        # Pattern to match ISO 8601 datetime (e.g., 2025-05-14T20:30:00.000Z)
-        iso_pattern = r'(\d{4}-\d{2}-\d{2})T(\d{2}:\d{2}):00\.000Z'
-        match = re.search(iso_pattern, message)
+        match = _ISO_DATETIME_RE.search(message)
         
         if match:
             date_str = match.group(1)  # YYYY-MM-DD
@@ -1284,6 +1297,47 @@ class OpenAIFunctionCaller:
             }
         return {}
 
+    def _extract_explicit_date(self, message: str) -> Optional[str]:
+        """
+        Extract an explicit numeric date (YYYY-MM-DD, YYYY M/D or MM/DD/YYYY).
+        
+        Args:
+            message: The message to extract the date from.
+            
+        Returns:
+            The date in YYYY-MM-DD format, or None if no valid date was found
+        """
+        for match in _EXPLICIT_DATE_RE.finditer(message):
+            g = match.groups()
+            if g[0]:
+                year, month, day = g[0], g[1], g[2]
+            elif g[3]:
+                year, month, day = g[3], g[4], g[5]
+            else:
+                year, month, day = g[8], g[6], g[7]
+            try:
+                return date(int(year), int(month), int(day)).isoformat()
+            except ValueError:
+                continue  # e.g. 2025-13-40; keep looking
+        return None
+
+    async def _extract_date(self, message: str) -> Optional[str]:
+        """
+        Extract a date from a message, only calling the LLM when the message
+        has no explicit numeric date.
+        
+        Args:
+            message: The message to extract the date from.
+            
+        Returns:
+            The date in YYYY-MM-DD format, or None if not found
+        """
+        date_str = self._extract_explicit_date(message)
+        if date_str:
+            self._logger.info(f"Extracted explicit date {date_str} without the LLM")
+            return date_str
+        return (await self._extract_datetime_with_llm(message)).get("date")
+
     def _extract_natural_language_datetime(self, message: str) -> Dict[str, str]:
         """
         Extract date and time from natural language expressions like "tomorrow at 2pm".
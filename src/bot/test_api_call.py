@@ -5,7 +5,6 @@ This script tests the Cal.com API integration with the chatbot by sending a mess
 and processing the response, showing the full interaction including API calls.
 """
 
-import asyncio
 import os
 import sys
 import json
@@ -17,10 +16,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 
 from src.bot.chatbot import CalendarAgent
 from src.api.cal_api import CalAPIClient
+from src.utils import aio
 
 # Set up logging
-logging.basicConfig(level=logging.INFO, 
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 async def test_booking_api():
@@ -75,11 +73,8 @@ async def test_chatbot():
     """Test the chatbot with a real message."""
     logger.info("Testing chatbot...")
     
-    # Create the agent
-    agent = CalendarAgent()
-    await agent.initialize()
-    
-    try:
+    # The agent is cleaned up even if the chat raises
+    async with CalendarAgent() as agent:
         # Get user email
         user_email = input("Enter your email: ")
         
@@ -119,10 +114,7 @@ async def test_chatbot():
                 
                 print(f"[Debug] Details: {json.dumps(debug_info)}")
     
-    finally:
-        # Clean up resources
-        await agent.cleanup()
-        logger.info("Chatbot test completed")
+    logger.info("Chatbot test completed")
 
 async def main():
     """Run the test."""
@@ -146,4 +138,4 @@ async def main():
 
 # Run the script
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    aio.run(main()) 
\ No newline at end of file
@@ -2,10 +2,8 @@
 Test script to specifically test the booking functionality with the updated API format.
 """
 
-import asyncio
 import os
 import sys
-import json
 import logging
 from datetime import datetime, timedelta
 
@@ -14,10 +12,9 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../.
 
 from src.bot.chatbot import CalendarAgent
 from src.api.cal_api import CalAPIClient
+from src.utils import aio, jsonfmt
 
 # Set up logging
-logging.basicConfig(level=logging.INFO, 
-                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 async def test_direct_booking():
@@ -49,7 +46,7 @@ async def test_direct_booking():
         else:
             # Calculate date for tomorrow
             tomorrow = datetime.now() + timedelta(days=1)
-            date_str = tomorrow.strftime("%Y-%m-%d")
+            date_str = tomorrow.date().isoformat()
             
             # Let the user choose a time or use a default
             time_str = input(f"Enter time (HH:MM) for {date_str} or press Enter for 14:30: ")
@@ -75,7 +72,7 @@ async def test_direct_booking():
         )
         
         # Display the result
-        logger.info(f"Booking result: {json.dumps(booking_result, indent=2)}")
+        logger.info("Booking result: %s", jsonfmt.lazy(booking_result))
         
         if booking_result.get("status") == "success":
             print("\n✅ Booking successful!")
@@ -91,17 +88,14 @@ async def test_chatbot_booking():
     """Test booking through the chatbot interface."""
     logger.info("Testing booking through chatbot")
     
-    # Create the agent
-    agent = CalendarAgent()
-    await agent.initialize()
-    
-    try:
+    # The agent is cleaned up even if the chat raises
+    async with CalendarAgent() as agent:
         # Get user email
         user_email = input("Enter your email: ")
         
         # Process a booking request
         tomorrow = datetime.now() + timedelta(days=1)
-        date_str = tomorrow.strftime("%Y-%m-%d")
+        date_str = tomorrow.date().isoformat()
         time_str = "14:30"
         
         booking_message = f"I want to book a meeting for {date_str} at {time_str}"
@@ -117,12 +111,9 @@ async def test_chatbot_booking():
         # Print detailed result
         print("\nDetailed result:")
         if response.get('details'):
-            print(json.dumps(response.get('details'), indent=2))
+            print(jsonfmt.pretty(response.get('details')))
     
-    finally:
-        # Clean up resources
-        await agent.cleanup()
-        logger.info("Chatbot test completed")
+    logger.info("Chatbot test completed")
 
 async def main():
     """Run the test."""
@@ -146,4 +137,4 @@ async def main():
 
 # Run the script
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    aio.run(main()) 
\ No newline at end of file
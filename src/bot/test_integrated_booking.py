@@ -4,36 +4,32 @@ Integrated booking flow test script.
 This script tests the entire booking flow from user message to API call with our fixed implementation.
 """
 
-import asyncio
 import os
 import sys
 import logging
+import pytest
 from datetime import datetime, timedelta
 
 # Add the parent directory to the path so we can import modules
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "../..")))
 
 from src.bot.chatbot import CalendarAgent
+from src.utils import aio
 
 # Set up logging
-logging.basicConfig(level=logging.INFO, 
-                   format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-async def test_integrated_booking():
+@pytest.mark.asyncio
+async def test_integrated_booking(agent):
     """Test the integrated booking flow from user message to API call."""
     logger.info("=== Integrated Booking Flow Test ===")
     
-    # Create the chatbot
-    agent = CalendarAgent()
-    await agent.initialize()
-    
     # Add user email to the conversation context
     agent.conversation_context["current_user_email"] = "test@example.com"
     
     # Get tomorrow's date for testing
     tomorrow = datetime.now() + timedelta(days=1)
-    tomorrow_str = tomorrow.strftime("%Y-%m-%d")
+    tomorrow_str = tomorrow.date().isoformat()
     
     # Format time in the evening (8:30 PM) when slots are likely available
     time_str = "20:30"
@@ -71,5 +67,9 @@ async def test_integrated_booking():
     
     logger.info("=== Integrated Booking Flow Test Complete ===")
 
+async def main():
+    async with CalendarAgent() as agent:
+        await test_integrated_booking(agent)
+
 if __name__ == "__main__":
-    asyncio.run(test_integrated_booking()) 
\ No newline at end of file
+    aio.run(main()) 
\ No newline at end of file
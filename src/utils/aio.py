@@ -0,0 +1,26 @@
+"""
+Event loop helpers for the command-line entry points.
+"""
+
+import asyncio
+
+try:
+    import uvloop
+except ImportError:
+    # uvloop has no Windows build; fall back to the stock asyncio loop
+    uvloop = None
+
+
+def run(main):
+    """
+    Run a coroutine to completion, on uvloop when it is installed.
+    
+    Args:
+        main: The coroutine to run
+        
+    Returns:
+        Whatever the coroutine returns
+    """
+    if uvloop is not None:
+        return uvloop.run(main)
+    return asyncio.run(main)
@@ -0,0 +1,53 @@
+"""
+JSON pretty-printing for the debug output of the test scripts.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def pretty(obj) -> str:
+    """
+    Render obj as indented JSON, using orjson when it is installed.
+    
+    Args:
+        obj: The JSON-compatible object to render
+        
+    Returns:
+        The JSON text with two-space indentation
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, indent=2)
+
+
+class _Lazy:
+    """Renders the wrapped object with pretty() when converted to str."""
+    
+    __slots__ = ("obj",)
+    
+    def __init__(self, obj):
+        self.obj = obj
+    
+    def __str__(self) -> str:
+        return pretty(self.obj)
+
+
+def lazy(obj) -> _Lazy:
+    """
+    Defer pretty() until the result is actually formatted.
+    
+    Pass it as a logging argument, e.g. logger.debug("Data: %s", lazy(obj)),
+    so a large payload is only serialized when the record is emitted.
+    
+    Args:
+        obj: The JSON-compatible object to render
+        
+    Returns:
+        A wrapper whose str() is the indented JSON
+    """
+    return _Lazy(obj)
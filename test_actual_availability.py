@@ -4,25 +4,41 @@ Test script to check actual availability for tomorrow for a 1-hour meeting.
 import os
 import sys
 import asyncio
-import json
+import pytest
 from datetime import datetime, timedelta
 
 # Add the parent directory to the path so we can import modules
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 from src.api.cal_api import CalAPIClient
+from src.utils import aio, jsonfmt
 
-async def test_availability():
+try:
+    from ciso8601 import parse_datetime as _parse_iso
+except ImportError:
+    _parse_iso = None
+
+
+def _parse_z(s: str) -> datetime:
+    """Parse a Cal.com 'Z'-suffixed ISO timestamp."""
+    if _parse_iso is not None:
+        return _parse_iso(s)
+    return datetime.fromisoformat(s.replace('Z', '+00:00'))
+
+
+@pytest.mark.asyncio
+async def test_availability(cal_api):
     """Test which time slots are actually available for tomorrow."""
     print("\n=== Testing Actual Availability ===")
     
-    # Create the Cal API client
-    cal_api = CalAPIClient()
-    
     # Get tomorrow's date
-    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    tomorrow = (datetime.now() + timedelta(days=1)).date().isoformat()
     print(f"Checking availability for: {tomorrow}")
     
+    # Slots to probe (2pm to 5pm), built once up front
+    hours = range(14, 18)
+    times = [f"{tomorrow}T{hour:02d}:00:00.000Z" for hour in hours]
+    
     # First, get the event types to find the 1-hour and 30-minute meeting types
     event_types_result = await cal_api.get_event_types()
     print("\nEvent Types:")
@@ -39,13 +55,15 @@ async def test_availability():
     availability_result = await cal_api.get_availability(event_type_id, tomorrow)
     
     print(f"\nAvailability for event type {event_type_id} on {tomorrow}:")
-    print(json.dumps(availability_result, indent=2))
+    print(jsonfmt.pretty(availability_result))
     
     # Extract and print available time slots
     if availability_result.get("status") == "success":
         availability_data = availability_result.get("availability", {})
         date_ranges = availability_data.get("dateRanges", [])
         
+        index = cal_api.build_availability_index(availability_result)
+        
         print("\nAvailable time slots:")
         for date_range in date_ranges:
             start = date_range.get("start")
@@ -54,19 +72,17 @@ async def test_availability():
             
             # Also check if specific times within this range are available
             if start and end:
-                start_dt = datetime.fromisoformat(start.replace('Z', '+00:00'))
-                pst_start = start_dt.strftime('%Y-%m-%d %H:%M:%S')
-                pst_end = datetime.fromisoformat(end.replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M:%S')
+                pst_start = _parse_z(start).strftime('%Y-%m-%d %H:%M:%S')
+                pst_end = _parse_z(end).strftime('%Y-%m-%d %H:%M:%S')
                 print(f"  PST: {pst_start} to {pst_end}")
                 
-                # Check specific times
-                for hour in range(14, 18):  # 2pm to 5pm
-                    time_str = f"{tomorrow}T{hour:02d}:00:00.000Z"
-                    is_available = await cal_api.is_time_available(event_type_id, time_str)
-                    print(f"  {hour}:00 PST ({time_str}) available: {is_available}")
-    
-    # Close the client
-    await cal_api.cleanup()
+                # Check specific times against the availability already fetched
+                for hour, time_str in zip(hours, times):
+                    print(f"  {hour}:00 PST ({time_str}) available: {time_str in index}")
+
+async def main():
+    async with CalAPIClient() as cal_api:
+        await test_availability(cal_api)
 
 if __name__ == "__main__":
-    asyncio.run(test_availability()) 
\ No newline at end of file
+    aio.run(main()) 
\ No newline at end of file
@@ -10,31 +10,30 @@ import json
 import logging
 import sys
 import os
+import pytest
 
 # Add the src directory to the path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '')))
 
 from src.api.cal_api import CalAPIClient
+from src.utils import aio
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def test_cal_api_connection():
+@pytest.mark.asyncio
+async def test_cal_api_connection(cal_api):
     """Test connection to Cal.com API and event type retrieval."""
     logger.info("===== Testing Cal.com API Connection =====")
     
-    # Initialize the Cal.com API client
-    cal_api = CalAPIClient()
-    
-    # Test API connection
-    logger.info("Testing API connection...")
-    connection_result = await cal_api.test_api_connection()
+    # Test API connection and check available event types; the two calls
+    # are independent, so issue them together
+    logger.info("Testing API connection and checking available event types...")
+    connection_result, event_types_result = await asyncio.gather(
+        cal_api.test_api_connection(),
+        cal_api.check_available_event_types(),
+    )
     logger.info(f"Connection test result: {connection_result}")
-    
-    # Check available event types
-    logger.info("Checking available event types...")
-    event_types_result = await cal_api.check_available_event_types()
     logger.info(f"Event types result status: {event_types_result.get('status')}")
     
     if event_types_result.get('status') == 'success':
@@ -49,5 +48,9 @@ async def test_cal_api_connection():
     
     logger.info("===== Test Complete =====")
 
+async def main():
+    async with CalAPIClient() as cal_api:
+        await test_cal_api_connection(cal_api)
+
 if __name__ == "__main__":
-    asyncio.run(test_cal_api_connection()) 
\ No newline at end of file
+    aio.run(main()) 
\ No newline at end of file
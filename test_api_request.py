@@ -7,8 +7,8 @@ import sys
 import json
 import traceback
 
-# Force reload of environment variables
-os.environ.clear()
+# Force reload of environment variables; override=True already lets .env
+# values win without wiping PATH and friends from the process environment
 load_dotenv(override=True)
 
 print("\n=== Testing API Service ===")
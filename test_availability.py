@@ -3,19 +3,15 @@
 Test script for availability slots
 """
 
-import asyncio
-import logging
+import pytest
 from src.bot.chatbot import CalendarAgent
+from src.utils import aio
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-async def main():
+@pytest.mark.asyncio
+async def test_availability_checks(agent):
+    """Ask for availability on a date, then follow up about the same day."""
     try:
-        # Initialize the calendar agent
-        agent = CalendarAgent()
-        await agent.initialize()
-        
         # Test the availability check
         print("Testing availability check...")
         response = await agent.process_message("when is available on May 17th, 2025?")
@@ -31,11 +27,13 @@ async def main():
         print(response.get("response", "No response"))
         print("\nDetails:")
         print(response.get("details", {}))
-        
-        # Clean up
-        await agent.cleanup()
     except Exception as e:
         print(f"Error: {e}")
 
+async def main():
+    # Initialize the calendar agent
+    async with CalendarAgent() as agent:
+        await test_availability_checks(agent)
+
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    aio.run(main()) 
\ No newline at end of file
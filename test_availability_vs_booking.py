@@ -5,30 +5,24 @@ to identify why slots appear available but can't be booked
 """
 
 import asyncio
-import logging
 import json
+import pytest
 from datetime import datetime, timedelta
 from src.api.cal_api import CalAPIClient
+from src.utils import aio
 
-# Set up detailed logging
-logging.basicConfig(
-    level=logging.INFO, 
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
 
-async def test_availability_vs_booking():
+@pytest.mark.asyncio
+async def test_availability_vs_booking(cal_api):
     """Compare availability check vs actual booking attempt"""
     try:
-        # Initialize Cal API client
-        cal_api = CalAPIClient()
-        
         # Test API connection
         connection_success = await cal_api.test_api_connection()
         print(f"API connection test: {'Success' if connection_success else 'Failed'}")
         
         # Get tomorrow's date for testing
         tomorrow = datetime.now() + timedelta(days=1)
-        test_date = tomorrow.strftime("%Y-%m-%d")
+        test_date = tomorrow.date().isoformat()
         test_time = "14:00:00"  # 2 PM
         test_iso = f"{test_date}T{test_time}.000Z"
         
@@ -46,13 +40,18 @@ async def test_availability_vs_booking():
         event_type_id = str(event_type.get("id"))
         print(f"Found event type: {event_type.get('title')} (ID: {event_type_id})")
         
+        # Steps 2 and 3 only need the event type, so run them concurrently
         # Step 2: Check availability for the date
-        print(f"\n[Step 2] Checking availability for date {test_date}")
-        availability_result = await cal_api.get_availability(
-            event_type_id=event_type_id, 
-            start_date=test_date
+        # Step 3: Check if our test time is available (API won't give a reliable answer)
+        availability_result, is_available = await asyncio.gather(
+            cal_api.get_availability(
+                event_type_id=event_type_id, 
+                start_date=test_date
+            ),
+            cal_api.is_time_available(event_type_id, test_iso)
         )
         
+        print(f"\n[Step 2] Checking availability for date {test_date}")
         if availability_result.get("status") != "success":
             print(f"Error getting availability: {availability_result.get('message')}")
             return
@@ -64,9 +63,7 @@ async def test_availability_vs_booking():
         for i, date_range in enumerate(date_ranges[:3]):  # Show first 3 ranges
             print(f"Range {i+1}: {date_range.get('start')} to {date_range.get('end')}")
         
-        # Step 3: Check if our test time is available (API won't give a reliable answer)
         print(f"\n[Step 3] Checking if specific time {test_iso} is available")
-        is_available = await cal_api.is_time_available(event_type_id, test_iso)
         print(f"API says time is available: {is_available}")
         
         # Step 4: Attempt to book the slot that should be available
@@ -106,7 +103,8 @@ async def test_availability_vs_booking():
         traceback.print_exc()
 
 async def main():
-    await test_availability_vs_booking()
+    async with CalAPIClient() as cal_api:
+        await test_availability_vs_booking(cal_api)
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    aio.run(main()) 
\ No newline at end of file
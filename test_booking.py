@@ -5,26 +5,20 @@ Debug test for booking functionality.
 
 import asyncio
 import logging
-import sys
 from datetime import datetime, timedelta
 from src.bot.chatbot import CalendarAgent
 from src.bot.openai_integration import OpenAIFunctionCaller
 from src.api.cal_api import CalAPIClient
+from src.utils import aio
 
-# Configure logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout)
-    ]
-)
-
+# Logging is configured by src.utils.config; run with LOG_LEVEL=DEBUG for the full trace
 logger = logging.getLogger("booking_test")
 
-async def test_event_types():
+# The helpers below are driven by main() with a shared client, not collected by pytest
+__test__ = False
+
+async def test_event_types(client):
     """Test getting event types from the API"""
-    client = CalAPIClient()
     logger.info("Getting available event types...")
     event_types = await client.check_available_event_types()
     
@@ -41,21 +35,27 @@ async def test_event_types():
     
     return None
 
-async def check_availability(event_type_id):
+async def check_availability(client, event_type_id):
     """Test checking availability for different dates"""
-    client = CalAPIClient()
     logger.info(f"Checking availability for event type {event_type_id}")
     
     # Try multiple dates (today plus 1-7 days)
     today = datetime.now()
+    dates = [(today + timedelta(days=days_ahead)).date().isoformat() for days_ahead in range(1, 8)]
     
-    for days_ahead in range(1, 8):
-        test_date = today + timedelta(days=days_ahead)
-        date_str = test_date.strftime("%Y-%m-%d")
-        
-        logger.info(f"Checking availability for {date_str}")
-        availability = await client.get_availability(event_type_id, date_str)
-        
+    # The dates are independent, so query them concurrently; the semaphore
+    # keeps us polite towards the Cal.com rate limit
+    semaphore = asyncio.Semaphore(4)
+    
+    async def fetch(date_str):
+        async with semaphore:
+            logger.info(f"Checking availability for {date_str}")
+            return await client.get_availability(event_type_id, date_str)
+    
+    results = await asyncio.gather(*(fetch(date_str) for date_str in dates))
+    
+    # Walk the results in date order so we still return the earliest slot
+    for date_str, availability in zip(dates, results):
         if availability.get("status") == "success":
             avail_data = availability.get("availability", {})
             date_ranges = avail_data.get("dateRanges", [])
@@ -74,9 +74,8 @@ async def check_availability(event_type_id):
     
     return None
 
-async def test_booking_with_found_slot(event_type_id, start_time):
+async def test_booking_with_found_slot(client, event_type_id, start_time):
     """Test booking with a time slot we found available"""
-    client = CalAPIClient()
     logger.info(f"Testing booking with found slot: {start_time}")
     
     result = await client.book_event(
@@ -98,27 +97,29 @@ async def main():
     """Main test function"""
     logger.info("Starting Cal.com API tests")
     
-    # First, get available event types
-    event_type_id = await test_event_types()
-    if not event_type_id:
-        logger.error("Could not find any event types, aborting test")
-        return
-    
-    # Force the use of 30 Min Meeting event type
-    event_type_id = 2477342
-    logger.info(f"Using event type ID: {event_type_id}")
-    
-    # Then check availability to find an open slot
-    available_time = await check_availability(event_type_id)
-    if not available_time:
-        logger.error("Could not find any available time slots, aborting test")
-        return
-    
-    logger.info(f"Found available time slot: {available_time}")
-    
-    # Finally, try to book the available slot
-    booking_result = await test_booking_with_found_slot(event_type_id, available_time)
-    logger.info("Test completed")
+    # One client for the whole run so every call reuses the same connections
+    async with CalAPIClient() as client:
+        # First, get available event types
+        event_type_id = await test_event_types(client)
+        if not event_type_id:
+            logger.error("Could not find any event types, aborting test")
+            return
+        
+        # Force the use of 30 Min Meeting event type
+        event_type_id = 2477342
+        logger.info(f"Using event type ID: {event_type_id}")
+        
+        # Then check availability to find an open slot
+        available_time = await check_availability(client, event_type_id)
+        if not available_time:
+            logger.error("Could not find any available time slots, aborting test")
+            return
+        
+        logger.info(f"Found available time slot: {available_time}")
+        
+        # Finally, try to book the available slot
+        booking_result = await test_booking_with_found_slot(client, event_type_id, available_time)
+        logger.info("Test completed")
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    aio.run(main()) 
\ No newline at end of file
@@ -3,20 +3,15 @@
 Comprehensive test for the booking flow with complex date/time formats
 """
 
-import asyncio
-import logging
+import pytest
 from src.bot.chatbot import CalendarAgent
+from src.utils import aio
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-async def test_complete_booking_flow():
+@pytest.mark.asyncio
+async def test_complete_booking_flow(agent):
     """Test a complete booking flow with complex date/time formats"""
     try:
-        # Initialize the calendar agent
-        agent = CalendarAgent()
-        await agent.initialize()
-        
         # Set user email in conversation context
         agent.conversation_context["current_user_email"] = "test@example.com"
         
@@ -43,16 +38,15 @@ async def test_complete_booking_flow():
         response = await agent.process_message(follow_up_request)
         print(f"BOT: {response.get('response', 'No response')}")
         
-        # Clean up
-        await agent.cleanup()
-        
     except Exception as e:
         print(f"Error during testing: {e}")
         import traceback
         traceback.print_exc()
 
 async def main():
-    await test_complete_booking_flow()
+    # Initialize the calendar agent
+    async with CalendarAgent() as agent:
+        await test_complete_booking_flow(agent)
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    aio.run(main()) 
\ No newline at end of file
@@ -4,12 +4,11 @@ Test script for testing time format handling in booking functions
 """
 
 import asyncio
-import logging
+import pytest
 from src.bot.chatbot import CalendarAgent
 from src.bot.openai_integration import OpenAIFunctionCaller
+from src.utils import aio
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
 async def test_openai_time_normalize():
     """Test the _normalize_time_format method in OpenAIFunctionCaller"""
@@ -37,14 +36,11 @@ async def test_openai_time_normalize():
         normalized = caller._normalize_time_format(test_case)
         print(f"'{test_case}' → '{normalized}'")
 
-async def test_bot_booking():
+@pytest.mark.asyncio
+async def test_bot_booking(agent):
     """Test the booking functionality with various time formats"""
     print("\n===== Testing Bot Booking with Various Time Formats =====")
     
-    # Initialize the calendar agent
-    agent = CalendarAgent()
-    await agent.initialize()
-    
     # Test booking with various time formats
     test_times = [
         "2025-05-19",  # Date only
@@ -54,25 +50,23 @@ async def test_bot_booking():
     ]
     
     try:
-        # Test a direct call to book_meeting with the problematic format
-        print("\nTesting direct book_meeting call...")
-        result = await agent.book_meeting(
-            date="2025-05-19",
-            time="9:00 AM PST",
-            name="Jisoo",
-            reason="offer review",
-            duration=30
+        # Test a direct call to book_meeting with the problematic format and the
+        # same request via message processing. They target different slots so
+        # neither conflicts with the other, which lets them run concurrently.
+        print("\nTesting direct book_meeting call and process_message...")
+        result, response = await asyncio.gather(
+            agent.book_meeting(
+                date="2025-05-19",
+                time="9:00 AM PST",
+                name="Jisoo",
+                reason="offer review",
+                duration=30
+            ),
+            agent.process_message("book me on Monday, May 19, 2025 at 10:00 AM PST, my name: jisoo, reason: offer review, 30minute meeting")
         )
         print(f"Result: {result.get('status', 'unknown')}")
         print(f"Message: {result.get('message', 'No message')}")
-        
-        # Test via message processing
-        print("\nTesting via process_message...")
-        response = await agent.process_message("book me on Monday, May 19, 2025 at 9:00 AM PST, my name: jisoo, reason: offer review, 30minute meeting")
         print(f"Response: {response.get('response', 'No response')}")
-        
-        # Clean up
-        await agent.cleanup()
     except Exception as e:
         print(f"Error during testing: {e}")
 
@@ -80,9 +74,12 @@ async def main():
     """Run all tests"""
     try:
         await test_openai_time_normalize()
-        await test_bot_booking()
+        
+        # Initialize the calendar agent
+        async with CalendarAgent() as agent:
+            await test_bot_booking(agent)
     except Exception as e:
         print(f"Error: {e}")
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    aio.run(main()) 
\ No newline at end of file
@@ -3,21 +3,16 @@
 Test script for the complete booking flow with availability check
 """
 
-import asyncio
-import logging
 from datetime import datetime, timedelta
+import pytest
 from src.bot.chatbot import CalendarAgent
+from src.utils import aio
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-async def test_booking_with_availability_check():
+@pytest.mark.asyncio
+async def test_booking_with_availability_check(agent):
     """Test booking with proper availability check"""
     try:
-        # Initialize the calendar agent
-        agent = CalendarAgent()
-        await agent.initialize()
-        
         # Set user email in conversation context
         agent.conversation_context["current_user_email"] = "test@example.com"
         
@@ -25,7 +20,7 @@ async def test_booking_with_availability_check():
         
         # Get tomorrow's date for testing
         tomorrow = datetime.now() + timedelta(days=1)
-        test_date = tomorrow.strftime("%Y-%m-%d")
+        test_date = tomorrow.date().isoformat()
         
         # Test 1: Try booking at a time that's outside of available hours (too early)
         outside_hours_time = "10:00 AM"
@@ -51,13 +46,13 @@ async def test_booking_with_availability_check():
             print(f"Found {len(slots)} available slots")
             
             # Display the first 3 slots
-            for i, slot in enumerate(slots[:3]):
-                print(f"Slot {i+1}: {slot.get('display')}")
+            if slots:
+                print("\n".join(f"Slot {i}: {slot['display']}" for i, slot in enumerate(slots[:3], 1)))
             
             # Test 3: Try booking at an available time
             if slots:
                 available_slot = slots[0]
-                available_time = available_slot.get("formatted_time")
+                available_time = available_slot["formatted_time"]
                 
                 print(f"\nTEST 3: Booking at {available_time} on {test_date} (Within Available Hours)")
                 booking_result = await agent.book_meeting(
@@ -94,16 +89,14 @@ async def test_booking_with_availability_check():
         response = await agent.process_message(availability_message)
         print(f"BOT: {response.get('response')}")
         
-        # Clean up
-        await agent.cleanup()
-        
     except Exception as e:
         print(f"Error during testing: {e}")
         import traceback
         traceback.print_exc()
 
 async def main():
-    await test_booking_with_availability_check()
+    async with CalendarAgent() as agent:
+        await test_booking_with_availability_check(agent)
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    aio.run(main()) 
\ No newline at end of file
@@ -3,14 +3,14 @@
 Test script for the Chatbot handling of get_available_slots
 """
 
-import asyncio
+import pytest
 from src.bot.chatbot import CalendarAgent
+from src.utils import aio
 
-async def main():
-    print("Initializing agent...")
-    agent = CalendarAgent()
-    
-    # Initialize the agent and add a system message
+@pytest.mark.asyncio
+async def test_soonest_available_slot(agent):
+    """Ask the agent for the soonest available 30 minute slot."""
+    # Add a system message
     agent.conversation_history.append({
         "role": "system", 
         "content": "You are a calendar scheduling assistant."
@@ -25,5 +25,10 @@ async def main():
     print("\nResponse:")
     print(response)
 
+async def main():
+    print("Initializing agent...")
+    agent = CalendarAgent()
+    await test_soonest_available_slot(agent)
+
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    aio.run(main()) 
\ No newline at end of file
@@ -12,32 +12,36 @@ import asyncio
 import logging
 import sys
 import os
+import pytest
+import httpx
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
 
 # Add the src directory to the path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '')))
 
+from src.api import cal_api as cal_api_module
 from src.bot.chatbot import CalendarAgent
-from src.api.cal_api import CalAPIClient
+from src.utils import aio
 
 # Configure logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def test_immediate_response():
+@pytest.mark.asyncio
+async def test_immediate_response(agent):
     """Test that the bot provides immediate responses without requiring confirmation."""
     print("\n===== Testing Immediate Response =====")
     
-    # Initialize the CalendarAgent
-    agent = CalendarAgent()
-    await agent.initialize()
+    # Fix "tomorrow" once for the whole test
+    tomorrow = (datetime.now() + timedelta(days=1)).date().isoformat()
     
     # Test messages with different date formats
     test_messages = [
         {
             "message": "Find the earliest available time for tomorrow",
             "description": "Tomorrow's date format",
-            "expected_date": (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+            "expected_date": tomorrow
         },
         {
             "message": "What's the earliest 30-minute slot on 2025-05-15?",
@@ -60,55 +64,62 @@ async def test_immediate_response():
     for test_case in test_messages:
         print(f"\n{test_case['description']}: '{test_case['message']}'")
         
+        # Only this case's turns need checking, not the whole history
+        before_len = len(agent.conversation_history)
+        
         # Get the response - expecting a string
         response = await agent.process_message(test_case["message"])
         
         # Print the bot's response
         print(f"Bot Response: {response}")
         
+        text = response.lower()
+        
         # Check if this was a successful test
-        if "earliest available" in response.lower() or "connection issues" in response.lower():
+        if "earliest available" in text or "connection issues" in text:
             print("✅ PASS: Bot provided immediate response without waiting for confirmation")
-        elif "I will now check" in response.lower() or "let me find" in response.lower():
+        elif "I will now check" in text or "let me find" in text:
             print("❌ FAIL: Bot did not provide immediate results, asks for confirmation instead")
         else:
             print("❓ UNKNOWN: Bot provided an unexpected response")
         
-        # Verify date parsing - check conversation history for expected date
-        conversation_history_str = str(agent.conversation_history)
-        if test_case["expected_date"] in conversation_history_str:
+        # Verify date parsing - check this case's turns for the expected date
+        new_turns = agent.conversation_history[before_len:]
+        if any(test_case["expected_date"] in str(turn) for turn in new_turns):
             print(f"✅ PASS: Bot correctly parsed the date {test_case['expected_date']}")
         else:
             print(f"❌ FAIL: Bot did not correctly parse the date {test_case['expected_date']}")
     
     print("\n===== Immediate Response Test Complete =====")
 
-async def test_api_interaction():
+@pytest.mark.asyncio
+async def test_api_interaction(cal_api):
     """Test interaction with the Cal.com API."""
     print("\n===== Testing Cal.com API Interaction =====")
     
     try:
-        # Initialize the Cal.com API client
-        cal_api = CalAPIClient()
+        tomorrow = (datetime.now() + timedelta(days=1)).date().isoformat()
         
-        # Test API connection
-        print("Testing API connection...")
-        connection_result = await cal_api.test_api_connection()
+        # The three calls are independent, so issue them together and
+        # report on them in order
+        print("Testing API connection, event types and availability...")
+        connection_result, event_types_result, availability_result = await asyncio.gather(
+            cal_api.test_api_connection(),
+            cal_api.check_available_event_types(),
+            cal_api.get_availability("2472559", tomorrow),
+        )
         print(f"API Connection: {'✅ Success' if connection_result else '❌ Failed'}")
         
         if connection_result:
             # Get available event types
             print("Checking available event types...")
-            event_types_result = await cal_api.check_available_event_types()
             if event_types_result.get("status") == "success":
                 print(f"✅ Successfully retrieved event types: {event_types_result}")
             else:
                 print(f"❌ Failed to retrieve event types: {event_types_result}")
             
             # Try to get availability for a specific date
-            tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
             print(f"Getting availability for {tomorrow}...")
-            availability_result = await cal_api.get_availability("2472559", tomorrow)
             if availability_result.get("status") == "success":
                 print(f"✅ Successfully retrieved availability: {availability_result}")
             else:
@@ -118,41 +129,57 @@ async def test_api_interaction():
     
     print("\n===== API Interaction Test Complete =====")
 
-async def test_error_handling():
+_UNAUTHORIZED_BODY = {"message": "Invalid API key"}
+
+def _unauthorized(request):
+    """httpx mock transport handler: reject every request with a 401."""
+    return httpx.Response(401, json=_UNAUTHORIZED_BODY)
+
+@asynccontextmanager
+async def _unauthorized_request(method, url, **kwargs):
+    """Stand-in for CalAPIClient._request that yields a 401 response."""
+    response = MagicMock(status=401)
+    response.json = AsyncMock(return_value=_UNAUTHORIZED_BODY)
+    response.text = AsyncMock(return_value='{"message": "Invalid API key"}')
+    yield response
+
+@pytest.mark.asyncio
+async def test_error_handling(agent):
     """Test the bot's ability to handle API errors gracefully."""
     print("\n===== Testing Error Handling =====")
     
-    # Initialize the CalendarAgent
-    agent = CalendarAgent()
-    await agent.initialize()
-    
-    # Test with intentionally bad API key
-    # Save the real API key
-    real_api_key = agent.cal_api.api_key
+    # Every Cal.com call is answered with a 401 locally, so the test
+    # doesn't depend on the real API rejecting a bad key
+    cal_api = agent.cal_api
+    real_client = cal_api.client
+    cal_api.client = httpx.AsyncClient(transport=httpx.MockTransport(_unauthorized))
+    # Drop availability cached by the earlier tests so the agent has to ask the API
+    cal_api.invalidate_availability()
     
     try:
-        print("Testing with invalid API key...")
-        agent.cal_api.api_key = "invalid_api_key"
-        agent.cal_api.headers["Authorization"] = f"Bearer invalid_api_key"
-        
-        # Send a message that requires API access
-        message = "Find the earliest available time tomorrow"
-        print(f"Sending message: '{message}'")
+        print("Testing with Cal.com rejecting the API key...")
+        with patch.object(cal_api, "_request", _unauthorized_request), \
+             patch.dict(cal_api_module._event_types_cache, clear=True):
+            # Send a message that requires API access
+            message = "Find the earliest available time tomorrow"
+            print(f"Sending message: '{message}'")
+            
+            response = await agent.process_message(message)
+            print(f"Bot Response: {response}")
         
-        response = await agent.process_message(message)
-        print(f"Bot Response: {response}")
+        text = response.lower()
         
         # Check if the response correctly indicates a connection problem
-        if "connection issues" in response.lower() or "error" in response.lower():
+        if "connection issues" in text or "error" in text:
             print("✅ PASS: Bot handled API error gracefully")
         else:
             print("❌ FAIL: Bot did not handle API error gracefully")
     except Exception as e:
         print(f"❌ Exception during error handling test: {str(e)}")
     finally:
-        # Restore the real API key
-        agent.cal_api.api_key = real_api_key
-        agent.cal_api.headers["Authorization"] = f"Bearer {real_api_key}"
+        # Restore the real HTTP client
+        await cal_api.client.aclose()
+        cal_api.client = real_client
     
     print("\n===== Error Handling Test Complete =====")
 
@@ -160,11 +187,13 @@ async def main():
     """Run all the tests."""
     print("===== Starting Cal.com Scheduling Agent Tests =====\n")
     
-    await test_immediate_response()
-    await test_api_interaction()
-    await test_error_handling()
+    # One agent, and the Cal.com client it owns, is shared by every test
+    async with CalendarAgent() as agent:
+        await test_immediate_response(agent)
+        await test_api_interaction(agent.cal_api)
+        await test_error_handling(agent)
     
     print("\n===== All Tests Complete =====")
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    aio.run(main()) 
\ No newline at end of file
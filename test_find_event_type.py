@@ -4,24 +4,23 @@ Test script to find the correct event type ID for a 1-hour meeting and check ava
 import os
 import sys
 import asyncio
-import json
+import logging
 from datetime import datetime, timedelta
-import time
 
 # Add the parent directory to the path so we can import modules
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 from src.api.cal_api import CalAPIClient
+from src.utils import aio, jsonfmt
 
-async def find_hour_meeting_type():
+logger = logging.getLogger(__name__)
+
+async def find_hour_meeting_type(cal_api):
     """
     Find the correct event type ID for a 1-hour meeting and check available time slots.
     """
     print("\n=== Finding 1-Hour Meeting Event Type ===")
     
-    # Create the Cal API client
-    cal_api = CalAPIClient()
-    
     # Get all event types
     event_types_result = await cal_api.get_event_types()
     
@@ -49,43 +48,30 @@ async def find_hour_meeting_type():
     target_event_id = hour_event_types[0].get('id') if hour_event_types else "2457598"
     
     # Get tomorrow's date
-    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    tomorrow = (datetime.now() + timedelta(days=1)).date().isoformat()
     print(f"\nChecking availability for event type {target_event_id} on {tomorrow}")
     
     # Check availability for tomorrow
     availability_result = await cal_api.get_availability(target_event_id, tomorrow)
     
     # Print availability result for debugging
-    print("\nRaw Availability Data:")
-    print(json.dumps(availability_result, indent=2))
-    
-    # Check if 2pm PST tomorrow is available
-    time_to_check = f"{tomorrow}T14:00:00.000Z"
-    print(f"\nSpecifically checking if 2:00 PM PST ({time_to_check}) is available:")
-    is_available = await cal_api.is_time_available(target_event_id, time_to_check)
-    print(f"2:00 PM PST is available: {is_available}")
-    
-    # Delay to avoid rate limits
-    time.sleep(1)
+    # The raw payload can be large; only serialize it when debugging
+    logger.debug("Raw Availability Data:\n%s", jsonfmt.lazy(availability_result))
     
-    # Check if 3pm PST tomorrow is available
-    time_to_check = f"{tomorrow}T15:00:00.000Z"
-    print(f"\nSpecifically checking if 3:00 PM PST ({time_to_check}) is available:")
-    is_available = await cal_api.is_time_available(target_event_id, time_to_check)
-    print(f"3:00 PM PST is available: {is_available}")
-    
-    # Delay to avoid rate limits
-    time.sleep(1)
-    
-    # Check if 4pm PST tomorrow is available
-    time_to_check = f"{tomorrow}T16:00:00.000Z"
-    print(f"\nSpecifically checking if 4:00 PM PST ({time_to_check}) is available:")
-    is_available = await cal_api.is_time_available(target_event_id, time_to_check)
-    print(f"4:00 PM PST is available: {is_available}")
-    
-    # Close the API client
-    if hasattr(cal_api, 'client') and cal_api.client:
-        await cal_api.client.aclose()
+    # Check if 2pm, 3pm and 4pm PST tomorrow are available, answered from
+    # the availability fetched above rather than one API call per time
+    probes = [("2:00 PM", f"{tomorrow}T14:00:00.000Z"),
+              ("3:00 PM", f"{tomorrow}T15:00:00.000Z"),
+              ("4:00 PM", f"{tomorrow}T16:00:00.000Z")]
+    index = cal_api.build_availability_index(availability_result)
+    for label, time_to_check in probes:
+        is_available = time_to_check in index
+        print(f"\nSpecifically checking if {label} PST ({time_to_check}) is available:")
+        print(f"{label} PST is available: {is_available}")
+
+async def main():
+    async with CalAPIClient() as cal_api:
+        await find_hour_meeting_type(cal_api)
 
 if __name__ == "__main__":
-    asyncio.run(find_hour_meeting_type()) 
\ No newline at end of file
+    aio.run(main()) 
\ No newline at end of file
@@ -7,27 +7,59 @@ responds with that information immediately, rather than requiring a follow-up "o
 
 import asyncio
 from datetime import datetime, timedelta
-import logging
 import sys
 import os
+import pytest
 
 # Add the src directory to the path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '')))
 
 from src.bot.chatbot import CalendarAgent
 from src.utils.config import logger
+from src.utils import aio
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
 
-async def test_find_earliest_slot():
+async def _run_case(test_case, cal_api):
+    """Run one test message on a fresh agent and return its report lines."""
+    # Each case gets its own conversation, sharing the Cal.com client
+    agent = CalendarAgent()
+    agent.cal_api = cal_api
+    
+    out = [f"\n{test_case['description']}"]
+    
+    # Get the response directly - now expecting a string
+    response = await agent.process_message(test_case["message"])
+    
+    # Print the bot's response and the action taken
+    out.append(f"Bot Response: {response}")
+    
+    text = response.lower()
+    
+    # Check if this was a successful test (no need to say "okay" to get results)
+    if "earliest available" in text or "connection issues" in text:
+        # Either it immediately provided availability information or properly handled an error
+        out.append("✅ PASS: Bot provided immediate response without requiring confirmation")
+    elif "I will now check" in text or "let me find" in text:
+        # It responded with a confirmation prompt rather than actual results
+        out.append("❌ FAIL: Bot did not provide immediate results, asks for confirmation instead")
+    else:
+        # Some other kind of response
+        out.append("❓ UNKNOWN: Bot provided an unexpected response")
+    
+    # Special test for the date format parsing
+    if "2025 5/15" in test_case["message"]:
+        if any("2025-05-15" in str(turn) for turn in agent.conversation_history):
+            out.append("✅ PASS: Bot correctly parsed the date 2025-05-15")
+        else:
+            out.append("❌ FAIL: Bot did not correctly parse the date 2025-05-15")
+    return out
+
+
+@pytest.mark.asyncio
+async def test_find_earliest_slot(agent):
     """Test that the bot provides immediate availability results without waiting for a confirmation."""
     print("\n===== Testing Immediate Availability Response =====")
     
-    # Initialize the CalendarAgent
-    agent = CalendarAgent()
-    await agent.initialize()
-    
     # Test messages
     test_messages = [
         {
@@ -48,35 +80,18 @@ async def test_find_earliest_slot():
         }
     ]
     
-    # Run each test case
-    for test_case in test_messages:
-        print(f"\n{test_case['description']}")
-        
-        # Get the response directly - now expecting a string
-        response = await agent.process_message(test_case["message"])
-        
-        # Print the bot's response and the action taken
-        print(f"Bot Response: {response}")
-        
-        # Check if this was a successful test (no need to say "okay" to get results)
-        if "earliest available" in response.lower() or "connection issues" in response.lower():
-            # Either it immediately provided availability information or properly handled an error
-            print("✅ PASS: Bot provided immediate response without requiring confirmation")
-        elif "I will now check" in response.lower() or "let me find" in response.lower():
-            # It responded with a confirmation prompt rather than actual results
-            print("❌ FAIL: Bot did not provide immediate results, asks for confirmation instead")
-        else:
-            # Some other kind of response
-            print("❓ UNKNOWN: Bot provided an unexpected response")
-        
-        # Special test for the date format parsing
-        if "2025 5/15" in test_case["message"]:
-            if "2025-05-15" in str(agent.conversation_history):
-                print("✅ PASS: Bot correctly parsed the date 2025-05-15")
-            else:
-                print("❌ FAIL: Bot did not correctly parse the date 2025-05-15")
+    # The cases are independent, so run them concurrently, each on its own
+    # conversation sharing the agent's Cal.com client, and report in order
+    # once all are done
+    reports = await asyncio.gather(*(_run_case(case, agent.cal_api) for case in test_messages))
+    for report in reports:
+        print("\n".join(report))
     
     print("\n===== Test Complete =====")
 
+async def main():
+    async with CalendarAgent() as agent:
+        await test_find_earliest_slot(agent)
+
 if __name__ == "__main__":
-    asyncio.run(test_find_earliest_slot()) 
\ No newline at end of file
+    aio.run(main()) 
\ No newline at end of file
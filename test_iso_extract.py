@@ -14,13 +14,14 @@ logging.basicConfig(
 
 logger = logging.getLogger("iso_test")
 
+# Pattern to match ISO 8601 datetime (e.g., 2025-05-14T20:30:00.000Z)
+_ISO_RE = re.compile(r'(\d{4}-\d{2}-\d{2})T(\d{2}:\d{2}):00\.000Z')
+
 def extract_iso_datetime(message: str):
     """
     Extract ISO 8601 datetime from a message.
     """
-    # Pattern to match ISO 8601 datetime (e.g., 2025-05-14T20:30:00.000Z)
-    iso_pattern = r'(\d{4}-\d{2}-\d{2})T(\d{2}:\d{2}):00\.000Z'
-    match = re.search(iso_pattern, message)
+    match = _ISO_RE.search(message)
     
     if match:
         date_str = match.group(1)  # YYYY-MM-DD
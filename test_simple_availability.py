@@ -5,22 +5,34 @@ import os
 import sys
 import asyncio
 import json
+import pytest
 from datetime import datetime, timedelta
 
 # Add the parent directory to the path so we can import modules
 sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
 from src.api.cal_api import CalAPIClient
+from src.utils import aio
 
-async def test_simple_availability():
+
+def _pst_label(hour_utc: int) -> str:
+    """Format a UTC hour as a 12-hour Pacific (UTC-7) clock label."""
+    hour_pst = (hour_utc - 7) % 24
+    am_pm = "AM" if hour_pst < 12 else "PM"
+    hour_display = hour_pst % 12 or 12
+    return f"{hour_display}:00 {am_pm}"
+
+
+# Display label for each UTC hour, built once
+_PST_LABELS = tuple(_pst_label(hour) for hour in range(24))
+
+@pytest.mark.asyncio
+async def test_simple_availability(cal_api):
     """Test simple availability check for 2-5pm tomorrow."""
     print("\n=== Testing Simple Availability ===")
     
-    # Create the Cal API client
-    cal_api = CalAPIClient()
-    
     # Get tomorrow's date
-    tomorrow = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
+    tomorrow = (datetime.now() + timedelta(days=1)).date().isoformat()
     print(f"Checking availability for: {tomorrow}")
     
     # Get the 30-minute meeting event type ID (we know this is 2457598)
@@ -52,23 +64,21 @@ async def test_simple_availability():
         f"{tomorrow}T17:00:00.000Z",  # 5pm
     ]
     
+    # The availability above already covers every probe, so check them locally
+    index = cal_api.build_availability_index(availability_result)
+    
     print("\nVerifying specific time slots:")
     for time_str in times_to_check:
+        is_available = time_str in index
         # Convert to a more readable format
-        time_parts = time_str.split("T")
-        hour = int(time_parts[1].split(":")[0])
-        hour_pst = (hour - 7) % 24
-        am_pm = "AM" if hour_pst < 12 else "PM"
-        hour_display = hour_pst % 12
-        if hour_display == 0:
-            hour_display = 12
-            
-        print(f"Checking {hour_display}:00 {am_pm} PST ({time_str})...")
-        is_available = await cal_api.is_time_available(event_type_id, time_str)
+        time_parts = time_str.split("T", 1)
+        label = _PST_LABELS[int(time_parts[1][:2])]
+        print(f"Checked {label} PST ({time_str})...")
         print(f"  Available: {is_available}")
-        
-        # Add a brief delay to avoid rate limits
-        await asyncio.sleep(1)
+
+async def main():
+    async with CalAPIClient() as cal_api:
+        await test_simple_availability(cal_api)
 
 if __name__ == "__main__":
-    asyncio.run(test_simple_availability()) 
\ No newline at end of file
+    aio.run(main()) 
\ No newline at end of file
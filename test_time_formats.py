@@ -4,77 +4,84 @@ Test script to verify time format handling in the Cal API
 """
 
 import asyncio
-import logging
-import json
 from datetime import datetime, timedelta
-from src.api.cal_api import CalAPIClient
+import pytest
 from src.bot.chatbot import CalendarAgent
+from conftest import new_agent
+from src.utils import aio
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
-async def test_time_formats():
+# Tomorrow's date, fixed once for the whole run
+_TOMORROW = (datetime.now() + timedelta(days=1)).date()
+_TEST_DATE = _TOMORROW.isoformat()
+
+# Time formats tried directly against book_meeting
+_TIME_FORMATS = (
+    "9:00 AM",
+    "09:00 AM",
+    "9:00AM",
+    "9:00 AM PST",
+    "9:00AM PST",
+    "9am",
+    "9AM",
+    "0900",
+    "09:00",
+    "17:00 UTC",  # This is equivalent to 9:00 AM PST
+)
+
+# Time formats sent through full booking messages
+_MESSAGE_TIME_FORMATS = ("9:00 AM PST", "5pm", "3:30 PM EST")
+
+
+@pytest.mark.asyncio
+async def test_time_formats(agent):
     """Test various time formats for booking"""
     try:
-        # Initialize the chat agent
-        agent = CalendarAgent()
-        await agent.initialize()
-        
         # Set user email in conversation context
         agent.conversation_context["current_user_email"] = "test@example.com"
         
-        # Get tomorrow's date for testing
-        tomorrow = datetime.now() + timedelta(days=1)
-        test_date = tomorrow.strftime("%Y-%m-%d")
-        
         print("\n===== Testing Various Time Formats =====")
         
-        # Test different time formats
-        time_formats = [
-            "9:00 AM",
-            "09:00 AM",
-            "9:00AM",
-            "9:00 AM PST",
-            "9:00AM PST",
-            "9am",
-            "9AM",
-            "0900",
-            "09:00",
-            "17:00 UTC"  # This is equivalent to 9:00 AM PST
-        ]
-        
-        for time_format in time_formats:
-            print(f"\nTesting time format: '{time_format}'")
-            
-            # Attempt to book with this time format
+        # Every format names the same real slot, so the bookings run one at a
+        # time: the first books it and the rest must see it taken. Run
+        # concurrently they would all pass the availability check and book
+        # the slot several times over. The report is printed in one go at the end.
+        lines = []
+        for time_format in _TIME_FORMATS:
             result = await agent.book_meeting(
-                date=test_date,
+                date=_TEST_DATE,
                 time=time_format,
                 name="Test User",
                 reason=f"Testing time format: {time_format}",
                 skip_availability_check=False
             )
-            
-            print(f"Status: {result.get('status')}")
-            print(f"Message: {result.get('message')}")
+            lines.append(f"\nTesting time format: '{time_format}'")
+            lines.append(f"Status: {result.get('status')}")
+            lines.append(f"Message: {result.get('message')}")
             
             # If there's a different error than availability, show it
             if result.get('status') == 'error' and 'not available' not in result.get('message', ''):
-                print(f"ERROR: {result.get('technical_details', 'No details')}")
+                lines.append(f"ERROR: {result.get('technical_details', 'No details')}")
+        print("\n".join(lines))
         
         # Test direct message parsing
         print("\n===== Testing Time Format Parsing Through Messages =====")
         
-        # Test a few messages with different time formats
-        for time_format in ["9:00 AM PST", "5pm", "3:30 PM EST"]:
-            message = f"I'd like to book a meeting on {test_date} at {time_format}"
-            print(f"\nUSER: {message}")
-            
-            response = await agent.process_message(message)
-            print(f"BOT: {response.get('response')}")
+        # Test a few messages with different time formats. Each is a separate
+        # conversation, so each gets its own agent sharing the Cal.com client.
+        messages = [
+            f"I'd like to book a meeting on {_TEST_DATE} at {time_format}"
+            for time_format in _MESSAGE_TIME_FORMATS
+        ]
+        responses = await asyncio.gather(*(
+            new_agent(agent.cal_api).process_message(message) for message in messages
+        ))
         
-        # Clean up
-        await agent.cleanup()
+        lines = []
+        for message, response in zip(messages, responses):
+            lines.append(f"\nUSER: {message}")
+            lines.append(f"BOT: {response.get('response')}")
+        print("\n".join(lines))
         
     except Exception as e:
         print(f"Error during testing: {e}")
@@ -82,7 +89,8 @@ async def test_time_formats():
         traceback.print_exc()
 
 async def main():
-    await test_time_formats()
+    async with CalendarAgent() as agent:
+        await test_time_formats(agent)
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    aio.run(main()) 
\ No newline at end of file
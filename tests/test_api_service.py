@@ -0,0 +1,98 @@
+"""
+Tests for the Streamlit client's backend API helpers.
+"""
+
+import pytest
+from unittest.mock import patch
+import httpx
+import api_service
+
+MESSAGES_URL = "http://backend/api/conversations/abc/messages"
+
+
+def _client(responses):
+    """
+    An httpx client that answers each request with the next item of `responses`.
+
+    Items are status codes, or exceptions to raise. Returns the client and the
+    list the handled requests are recorded in.
+    """
+    requests = []
+    replies = iter(responses)
+
+    def handler(request):
+        requests.append(request)
+        reply = next(replies)
+        if isinstance(reply, Exception):
+            raise reply
+        return httpx.Response(reply, json=[])
+
+    return httpx.Client(transport=httpx.MockTransport(handler)), requests
+
+
+@pytest.fixture(autouse=True)
+def no_backoff():
+    """Skip the real sleeps between retries, recording the delays instead."""
+    with patch.object(api_service.time, "sleep") as sleep:
+        yield sleep
+
+
+def test_get_retries_gateway_error_then_succeeds(no_backoff):
+    """Test that a 503 is retried with backoff and the later success returned."""
+    client, requests = _client([503, 200])
+    with patch.object(api_service, "_CLIENT", client):
+        response = api_service._get(MESSAGES_URL)
+    assert response.status_code == 200
+    assert len(requests) == 2
+    no_backoff.assert_called_once_with(api_service._BACKOFF_FACTOR)
+
+
+def test_get_retries_read_timeout_then_succeeds(no_backoff):
+    """Test that a read timeout is retried."""
+    client, requests = _client([httpx.ReadTimeout("slow"), 200])
+    with patch.object(api_service, "_CLIENT", client):
+        response = api_service._get(MESSAGES_URL)
+    assert response.status_code == 200
+    assert len(requests) == 2
+
+
+def test_get_returns_last_gateway_error_when_retries_exhausted(no_backoff):
+    """Test that the final 5xx response is returned once the retries run out."""
+    client, requests = _client([502, 503, 504])
+    with patch.object(api_service, "_CLIENT", client):
+        response = api_service._get(MESSAGES_URL)
+    assert response.status_code == 504
+    assert len(requests) == api_service._GET_RETRIES + 1
+    assert [call.args[0] for call in no_backoff.call_args_list] == [
+        api_service._BACKOFF_FACTOR * (2 ** attempt) for attempt in range(api_service._GET_RETRIES)
+    ]
+
+
+def test_get_raises_read_timeout_when_retries_exhausted(no_backoff):
+    """Test that the last read timeout is raised once the retries run out."""
+    client, requests = _client([httpx.ReadTimeout("slow")] * (api_service._GET_RETRIES + 1))
+    with patch.object(api_service, "_CLIENT", client), pytest.raises(httpx.ReadTimeout):
+        api_service._get(MESSAGES_URL)
+    assert len(requests) == api_service._GET_RETRIES + 1
+
+
+def test_get_does_not_retry_client_errors(no_backoff):
+    """Test that a 404 is returned straight away."""
+    client, requests = _client([404])
+    with patch.object(api_service, "_CLIENT", client):
+        response = api_service._get(MESSAGES_URL)
+    assert response.status_code == 404
+    assert len(requests) == 1
+    no_backoff.assert_not_called()
+
+
+@pytest.mark.parametrize("reply", [503, httpx.ReadTimeout("slow")])
+def test_post_chat_is_not_retried(no_backoff, reply):
+    """Test that POST /chat is sent once, since replaying it could book twice."""
+    client, requests = _client([reply])
+    with patch.object(api_service, "_CLIENT", client):
+        result = api_service.send_message("Book tomorrow at 3pm", "user@example.com")
+    assert "error" in result
+    assert len(requests) == 1
+    assert requests[0].method == "POST"
+    no_backoff.assert_not_called()
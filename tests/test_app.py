@@ -0,0 +1,167 @@
+"""
+Tests for the FastAPI application.
+"""
+
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from src.app import app, Conversation, InMemoryConversationStore, RedisConversationStore
+
+# Not used as a context manager, so the lifespan handler (which creates the
+# Cal.com client) doesn't run
+client = TestClient(app)
+
+
+@pytest.mark.parametrize("path", ["/chat", "/api/calendar/events"])
+def test_unauthenticated_malformed_body_rejected(path):
+    """Test that a missing API key is rejected before the body is parsed."""
+    response = client.post(path, content=b"{not json", headers={"Content-Type": "application/json"})
+    assert response.status_code == 401
+    assert "not json" not in response.text
+
+
+@pytest.mark.parametrize("path", ["/chat", "/api/calendar/events"])
+def test_wrong_api_key_malformed_body_rejected(path):
+    """Test that a wrong API key is rejected before the body is parsed."""
+    response = client.post(path, content=b"{not json", headers={"X-API-Key": "wrong-key"})
+    assert response.status_code == 401
+
+
+def test_calendar_route_without_startup_returns_503():
+    """Test that a missing Cal.com client is reported as 503, not a crash."""
+    with patch("src.app._VALID_API_KEY", b"test-key"):
+        response = client.get(
+            "/api/calendar/availability",
+            params={"event_type_id": "1", "start_date": "2024-06-01", "end_date": "2024-06-02"},
+            headers={"X-API-Key": "test-key"},
+        )
+    assert response.status_code == 503
+    assert response.json()["detail"] == "Cal.com API client is not available"
+
+
+def _conversation(user_email: str) -> Conversation:
+    """A fresh conversation for the given user."""
+    return Conversation(user_email=user_email)
+
+
+@pytest.mark.asyncio
+async def test_in_memory_store_lists_user_conversations_in_creation_order():
+    """Test that filtering by user keeps the conversations in creation order."""
+    store = InMemoryConversationStore(max_conversations=100)
+    conversations = [_conversation("a@example.com") for _ in range(20)]
+    for conversation in conversations:
+        await store.create(conversation)
+        await store.create(_conversation("b@example.com"))
+    
+    summaries = await store.list_summaries("a@example.com")
+    assert [summary["id"] for summary in summaries] == [c.id for c in conversations]
+    
+    await store.delete(conversations[3].id)
+    summaries = await store.list_summaries("a@example.com")
+    assert [summary["id"] for summary in summaries] == [c.id for c in conversations if c is not conversations[3]]
+
+
+@pytest.mark.asyncio
+async def test_in_memory_store_evicts_least_recently_used():
+    """Test that the store keeps at most max_conversations, dropping the least recently used."""
+    store = InMemoryConversationStore(max_conversations=2)
+    first, second, third = (_conversation("a@example.com") for _ in range(3))
+    await store.create(first)
+    await store.create(second)
+    # Touching the first conversation makes the second the oldest
+    await store.get_summary(first.id)
+    await store.create(third)
+    
+    assert await store.exists(first.id)
+    assert not await store.exists(second.id)
+    assert await store.exists(third.id)
+    summaries = await store.list_summaries("a@example.com")
+    assert [summary["id"] for summary in summaries] == [first.id, third.id]
+
+
+@pytest.mark.asyncio
+async def test_in_memory_store_append_to_evicted_conversation():
+    """Test that appending to a conversation evicted mid-turn doesn't raise."""
+    store = InMemoryConversationStore(max_conversations=1)
+    conversation = _conversation("a@example.com")
+    await store.create(conversation)
+    await store.append_message(conversation.id, {"role": "user", "content": "hi"}, "2024-01-01T00:00:00+00:00")
+    
+    # Another conversation is created while the agent is answering
+    await store.create(_conversation("b@example.com"))
+    await store.append_message(conversation.id, {"role": "assistant", "content": "hello"}, "2024-01-01T00:00:01+00:00")
+    
+    assert await store.get_messages(conversation.id) is None
+
+
+@pytest.fixture
+def redis_store():
+    """A RedisConversationStore backed by fakeredis."""
+    redis = pytest.importorskip("redis.asyncio")
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    with patch.object(redis.Redis, "from_url", return_value=fakeredis.FakeAsyncRedis(decode_responses=True)):
+        return RedisConversationStore("redis://localhost", ttl=60)
+
+
+@pytest.mark.asyncio
+async def test_redis_store_append_refreshes_every_key(redis_store):
+    """Test that appending a message refreshes the TTL of the user's conversation set too."""
+    conversation = _conversation("a@example.com")
+    await redis_store.create(conversation)
+    user_key = redis_store._user_key("a@example.com")
+    await redis_store.redis.expire(user_key, 5)
+    
+    await redis_store.append_message(conversation.id, {"role": "user", "content": "hi"}, "2024-01-01T00:00:00+00:00")
+    
+    assert await redis_store.redis.ttl(user_key) > 5
+    assert await redis_store.redis.ttl(redis_store._meta_key(conversation.id)) > 5
+    assert await redis_store.redis.ttl(redis_store._msgs_key(conversation.id)) > 5
+    assert await redis_store.get_messages(conversation.id) == [{"role": "user", "content": "hi"}]
+    summary = await redis_store.get_summary(conversation.id)
+    assert summary["updated_at"] == "2024-01-01T00:00:00+00:00"
+    assert summary["message_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_redis_store_append_to_expired_conversation(redis_store):
+    """Test that appending to an expired conversation leaves no orphan keys."""
+    await redis_store.append_message("gone", {"role": "user", "content": "hi"}, "2024-01-01T00:00:00+00:00")
+    
+    assert not await redis_store.exists("gone")
+    assert await redis_store.redis.exists(redis_store._msgs_key("gone")) == 0
+
+
+@pytest.mark.asyncio
+async def test_redis_store_list_summaries(redis_store):
+    """Test listing a user's conversations in creation order, dropping expired ids."""
+    conversations = [
+        Conversation(user_email="a@example.com", created_at=f"2024-01-0{day}T00:00:00+00:00")
+        for day in range(1, 5)
+    ]
+    for conversation in conversations:
+        await redis_store.create(conversation)
+    await redis_store.create(_conversation("b@example.com"))
+    await redis_store.append_message(conversations[0].id, {"role": "user", "content": "hi"}, "2024-01-05T00:00:00+00:00")
+    # Simulate one conversation expiring while its id is still in the user's set
+    await redis_store.redis.delete(redis_store._meta_key(conversations[2].id))
+    
+    summaries = await redis_store.list_summaries("a@example.com")
+    
+    expected = [conversations[0], conversations[1], conversations[3]]
+    assert [summary["id"] for summary in summaries] == [c.id for c in expected]
+    assert summaries[0]["message_count"] == 1
+    assert await redis_store.redis.smembers(redis_store._user_key("a@example.com")) == {c.id for c in expected}
+    assert len(await redis_store.list_summaries()) == 4
+
+
+@pytest.mark.asyncio
+async def test_redis_store_delete(redis_store):
+    """Test that deleting a conversation removes its keys and its id from the user's set."""
+    conversation = _conversation("a@example.com")
+    await redis_store.create(conversation)
+    
+    assert await redis_store.delete(conversation.id)
+    assert not await redis_store.exists(conversation.id)
+    assert await redis_store.list_summaries("a@example.com") == []
+    assert not await redis_store.delete(conversation.id)
@@ -2,9 +2,10 @@
 Tests for the Cal.com API client.
 """
 
+import asyncio
 import pytest
 import os
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from src.api.cal_api import CalAPIClient
 import httpx
 
@@ -93,12 +94,11 @@ async def test_test_api_connection():
         mock_response.status_code = 200
         mock_get.return_value = mock_response
         
-        cal_client = CalAPIClient()
-        result = await cal_client.test_api_connection()
-        
-        assert result is True
-        mock_get.assert_called_once()
-        await cal_client.client.aclose()
+        async with CalAPIClient() as cal_client:
+            result = await cal_client.test_api_connection()
+            
+            assert result is True
+            mock_get.assert_called_once()
 
 @pytest.mark.asyncio
 async def test_get_event_types():
@@ -112,12 +112,11 @@ async def test_get_event_types():
         mock_response.json.return_value = MOCK_EVENT_TYPES_RESPONSE
         mock_get.return_value = mock_response
         
-        cal_client = CalAPIClient()
-        result = await cal_client.get_event_types()
-        
-        assert result == MOCK_EVENT_TYPES_RESPONSE
-        mock_get.assert_called_once()
-        await cal_client.client.aclose()
+        async with CalAPIClient() as cal_client:
+            result = await cal_client.get_event_types()
+            
+            assert result == MOCK_EVENT_TYPES_RESPONSE
+            mock_get.assert_called_once()
 
 @pytest.mark.asyncio
 async def test_get_available_slots():
@@ -131,16 +130,15 @@ async def test_get_available_slots():
         mock_response.json.return_value = MOCK_SLOTS_RESPONSE
         mock_get.return_value = mock_response
         
-        cal_client = CalAPIClient()
-        result = await cal_client.get_available_slots(
-            event_type_id="1",
-            start_time="2023-06-01T00:00:00Z",
-            end_time="2023-06-02T23:59:59Z"
-        )
-        
-        assert result == MOCK_SLOTS_RESPONSE
-        mock_get.assert_called_once()
-        await cal_client.client.aclose()
+        async with CalAPIClient() as cal_client:
+            result = await cal_client.get_available_slots(
+                event_type_id="1",
+                start_time="2023-06-01T00:00:00Z",
+                end_time="2023-06-02T23:59:59Z"
+            )
+            
+            assert result == MOCK_SLOTS_RESPONSE
+            mock_get.assert_called_once()
 
 @pytest.mark.asyncio
 async def test_book_event():
@@ -154,32 +152,31 @@ async def test_book_event():
         mock_response.json.return_value = MOCK_BOOKING_RESPONSE
         mock_post.return_value = mock_response
         
-        cal_client = CalAPIClient()
-        result = await cal_client.book_event(
-            event_type_id="1",
-            start_time="2023-06-01T09:00:00.000Z",
-            name="John Doe",
-            email="john@example.com",
-            reason="Discuss project"
-        )
-        
-        assert result["status"] == "success"
-        assert result["booking"] == MOCK_BOOKING_RESPONSE
-        
-        # Verify the payload sent to the API
-        called_kwargs = mock_post.call_args.kwargs
-        assert "json" in called_kwargs
-        
-        payload = called_kwargs["json"]
-        assert payload["eventTypeId"] == "1"
-        assert payload["start"] == "2023-06-01T09:00:00.000Z"
-        assert len(payload["attendees"]) == 1
-        assert payload["attendees"][0]["name"] == "John Doe"
-        assert payload["attendees"][0]["email"] == "john@example.com"
-        assert "responses" in payload
-        assert payload["responses"]["reason"] == "Discuss project"
-        
-        await cal_client.client.aclose()
+        async with CalAPIClient() as cal_client:
+            result = await cal_client.book_event(
+                event_type_id="1",
+                start_time="2023-06-01T09:00:00.000Z",
+                name="John Doe",
+                email="john@example.com",
+                reason="Discuss project"
+            )
+            
+            assert result["status"] == "success"
+            assert result["booking"] == MOCK_BOOKING_RESPONSE
+            
+            # Verify the payload sent to the API
+            called_kwargs = mock_post.call_args.kwargs
+            assert "json" in called_kwargs
+            
+            payload = called_kwargs["json"]
+            assert payload["eventTypeId"] == "1"
+            assert payload["start"] == "2023-06-01T09:00:00.000Z"
+            assert len(payload["attendees"]) == 1
+            assert payload["attendees"][0]["name"] == "John Doe"
+            assert payload["attendees"][0]["email"] == "john@example.com"
+            assert "responses" in payload
+            assert payload["responses"]["reason"] == "Discuss project"
+            
 
 @pytest.mark.asyncio
 async def test_book_event_error():
@@ -198,18 +195,17 @@ async def test_book_event_error():
             )
         )
         
-        cal_client = CalAPIClient()
-        result = await cal_client.book_event(
-            event_type_id="1",
-            start_time="invalid_time",
-            name="John Doe",
-            email="john@example.com"
-        )
-        
-        assert result["status"] == "error"
-        assert "HTTP error 400" in result["message"]
-        
-        await cal_client.client.aclose()
+        async with CalAPIClient() as cal_client:
+            result = await cal_client.book_event(
+                event_type_id="1",
+                start_time="invalid_time",
+                name="John Doe",
+                email="john@example.com"
+            )
+            
+            assert result["status"] == "error"
+            assert "HTTP error 400" in result["message"]
+            
 
 @pytest.mark.asyncio
 async def test_list_bookings_all():
@@ -221,11 +217,10 @@ async def test_list_bookings_all():
         mock_response.status_code = 200
         mock_response.json.return_value = MOCK_BOOKINGS_RESPONSE
         mock_get.return_value = mock_response
-        cal_client = CalAPIClient()
-        result = await cal_client.list_bookings()
-        assert result["status"] == "success"
-        assert len(result["bookings"]) == 3
-        await cal_client.client.aclose()
+        async with CalAPIClient() as cal_client:
+            result = await cal_client.list_bookings()
+            assert result["status"] == "success"
+            assert len(result["bookings"]) == 3
 
 @pytest.mark.asyncio
 async def test_list_bookings_filter_email():
@@ -237,13 +232,12 @@ async def test_list_bookings_filter_email():
         mock_response.status_code = 200
         mock_response.json.return_value = MOCK_BOOKINGS_RESPONSE
         mock_get.return_value = mock_response
-        cal_client = CalAPIClient()
-        result = await cal_client.list_bookings(email="john@example.com")
-        assert result["status"] == "success"
-        assert len(result["bookings"]) == 2
-        for booking in result["bookings"]:
-            assert any(a["email"] == "john@example.com" for a in booking["attendees"])
-        await cal_client.client.aclose()
+        async with CalAPIClient() as cal_client:
+            result = await cal_client.list_bookings(email="john@example.com")
+            assert result["status"] == "success"
+            assert len(result["bookings"]) == 2
+            for booking in result["bookings"]:
+                assert any(a["email"] == "john@example.com" for a in booking["attendees"])
 
 @pytest.mark.asyncio
 async def test_list_bookings_error():
@@ -256,11 +250,10 @@ async def test_list_bookings_error():
             request=MagicMock(),
             response=MagicMock(status_code=500, text="Internal Server Error")
         )
-        cal_client = CalAPIClient()
-        result = await cal_client.list_bookings()
-        assert result["status"] == "error"
-        assert "HTTP error 500" in result["message"]
-        await cal_client.client.aclose()
+        async with CalAPIClient() as cal_client:
+            result = await cal_client.list_bookings()
+            assert result["status"] == "error"
+            assert "HTTP error 500" in result["message"]
 
 @pytest.mark.asyncio
 async def test_cancel_booking_success():
@@ -273,12 +266,11 @@ async def test_cancel_booking_success():
         mock_response.text = '{"message": "Booking cancelled"}'
         mock_response.json.return_value = MOCK_CANCEL_RESPONSE
         mock_delete.return_value = mock_response
-        cal_client = CalAPIClient()
-        result = await cal_client.cancel_booking(booking_id="booking1")
-        assert result["status"] == "success"
-        assert result["booking_id"] == "booking1"
-        assert result["details"] == MOCK_CANCEL_RESPONSE
-        await cal_client.client.aclose()
+        async with CalAPIClient() as cal_client:
+            result = await cal_client.cancel_booking(booking_id="booking1")
+            assert result["status"] == "success"
+            assert result["booking_id"] == "booking1"
+            assert result["details"] == MOCK_CANCEL_RESPONSE
 
 @pytest.mark.asyncio
 async def test_cancel_booking_error():
@@ -291,12 +283,11 @@ async def test_cancel_booking_error():
             request=MagicMock(),
             response=MagicMock(status_code=404, text="Not Found")
         )
-        cal_client = CalAPIClient()
-        result = await cal_client.cancel_booking(booking_id="booking1")
-        assert result["status"] == "error"
-        assert result["booking_id"] == "booking1"
-        assert "HTTP error 404" in result["message"]
-        await cal_client.client.aclose()
+        async with CalAPIClient() as cal_client:
+            result = await cal_client.cancel_booking(booking_id="booking1")
+            assert result["status"] == "error"
+            assert result["booking_id"] == "booking1"
+            assert "HTTP error 404" in result["message"]
 
 @pytest.mark.asyncio
 async def test_reschedule_booking_success():
@@ -309,12 +300,11 @@ async def test_reschedule_booking_success():
         mock_response.text = '{"message": "Booking rescheduled"}'
         mock_response.json.return_value = MOCK_RESCHEDULE_RESPONSE
         mock_patch.return_value = mock_response
-        cal_client = CalAPIClient()
-        result = await cal_client.reschedule_booking(booking_id="booking1", new_start_time="2024-06-21T10:00:00.000Z")
-        assert result["status"] == "success"
-        assert result["booking_id"] == "booking1"
-        assert result["details"] == MOCK_RESCHEDULE_RESPONSE
-        await cal_client.client.aclose()
+        async with CalAPIClient() as cal_client:
+            result = await cal_client.reschedule_booking(booking_id="booking1", new_start_time="2024-06-21T10:00:00.000Z")
+            assert result["status"] == "success"
+            assert result["booking_id"] == "booking1"
+            assert result["details"] == MOCK_RESCHEDULE_RESPONSE
 
 @pytest.mark.asyncio
 async def test_reschedule_booking_error():
@@ -327,9 +317,79 @@ async def test_reschedule_booking_error():
             request=MagicMock(),
             response=MagicMock(status_code=400, text="Bad Request")
         )
-        cal_client = CalAPIClient()
-        result = await cal_client.reschedule_booking(booking_id="booking1", new_start_time="2024-06-21T10:00:00.000Z")
-        assert result["status"] == "error"
-        assert result["booking_id"] == "booking1"
-        assert "HTTP error 400" in result["message"]
-        await cal_client.client.aclose() 
\ No newline at end of file
+        async with CalAPIClient() as cal_client:
+            result = await cal_client.reschedule_booking(booking_id="booking1", new_start_time="2024-06-21T10:00:00.000Z")
+            assert result["status"] == "error"
+            assert result["booking_id"] == "booking1"
+            assert "HTTP error 400" in result["message"]
+
+MOCK_AVAILABILITY_RESULT = {
+    "status": "success",
+    "availability": {
+        "dateRanges": [
+            {"start": "2023-06-01T16:00:00.000Z", "end": "2023-06-01T17:00:00.000Z"},
+            {"start": "2023-06-01T20:00:00.000Z", "end": "2023-06-01T22:00:00.000Z"},
+            {"start": "2023-06-01T21:00:00.000Z", "end": "2023-06-01T23:00:00.000Z"}
+        ]
+    }
+}
+
+@pytest.mark.asyncio
+async def test_build_availability_index():
+    """Test answering availability checks from one get_availability result."""
+    with patch('src.api.cal_api.CAL_API_KEY', 'test_api_key'), \
+         patch('src.api.cal_api.CAL_API_URL', 'https://api.cal.com/v1'):
+        async with CalAPIClient() as cal_client:
+            index = cal_client.build_availability_index(MOCK_AVAILABILITY_RESULT)
+            
+            # Inside a range, and inside the overlapping ranges merged together
+            assert "2023-06-01T16:30:00.000Z" in index
+            assert "2023-06-01T22:30:00.000Z" in index
+            # Outside every range, but the date has ranges (same fallback as is_time_available)
+            assert "2023-06-01T18:00:00.000Z" in index
+            # No ranges on that date
+            assert "2023-06-02T16:30:00.000Z" not in index
+            
+            # A failed lookup gives an empty index
+            failed = cal_client.build_availability_index({"status": "error", "message": "boom"})
+            assert "2023-06-01T16:30:00.000Z" not in failed
+            
+
+@pytest.mark.asyncio
+async def test_async_context_manager_closes_client():
+    """Test that leaving the async with block closes the HTTP client."""
+    with patch('src.api.cal_api.CAL_API_KEY', 'test_api_key'), \
+         patch('src.api.cal_api.CAL_API_URL', 'https://api.cal.com/v1'):
+        async with CalAPIClient() as cal_client:
+            assert not cal_client.client.is_closed
+        assert cal_client.client.is_closed
+
+@pytest.mark.asyncio
+async def test_get_availability_cached_until_invalidated():
+    """Test that repeated availability lookups reuse the first successful result."""
+    with patch('src.api.cal_api.CAL_API_KEY', 'test_api_key'), \
+         patch('src.api.cal_api.CAL_API_URL', 'https://api.cal.com/v1'):
+        async with CalAPIClient() as cal_client:
+            with patch.object(cal_client, '_fetch_availability', AsyncMock(return_value=MOCK_AVAILABILITY_RESULT)) as mock_fetch:
+                first = await cal_client.get_availability("1", "2023-06-01")
+                second = await cal_client.get_availability("1", "2023-06-01")
+                assert first == second == MOCK_AVAILABILITY_RESULT
+                mock_fetch.assert_awaited_once()
+                
+                # A booking change forces a fresh lookup
+                cal_client.invalidate_availability()
+                await cal_client.get_availability("1", "2023-06-01")
+                assert mock_fetch.await_count == 2
+
+@pytest.mark.asyncio
+async def test_get_availability_shares_concurrent_fetch():
+    """Test that concurrent lookups of the same dates make a single request."""
+    with patch('src.api.cal_api.CAL_API_KEY', 'test_api_key'), \
+         patch('src.api.cal_api.CAL_API_URL', 'https://api.cal.com/v1'):
+        async with CalAPIClient() as cal_client:
+            with patch.object(cal_client, '_fetch_availability', AsyncMock(return_value=MOCK_AVAILABILITY_RESULT)) as mock_fetch:
+                results = await asyncio.gather(*(
+                    cal_client.get_availability("1", "2023-06-01") for _ in range(5)
+                ))
+                assert all(result == MOCK_AVAILABILITY_RESULT for result in results)
+                mock_fetch.assert_awaited_once()
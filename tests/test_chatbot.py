@@ -5,7 +5,7 @@ Tests for the chatbot module.
 import pytest
 import os
 from unittest.mock import patch, MagicMock, AsyncMock
-from src.bot.chatbot import CalendarAgent
+from src.bot.chatbot import CalendarAgent, _parse_clock_time
 import json
 
 # Sample response for mocking
@@ -312,4 +312,64 @@ async def test_reschedule_event_api_error():
         assert result["action"] == "reschedule_event"
         assert result["status"] == "error"
         assert "Failed to reschedule event" in result["message"]
-        mock_cal_api.reschedule_booking.assert_called_once_with("booking1", "2024-06-21T10:00:00.000Z") 
\ No newline at end of file
+        mock_cal_api.reschedule_booking.assert_called_once_with("booking1", "2024-06-21T10:00:00.000Z") 
+
+@pytest.mark.parametrize("value,expected", [
+    ("9:00 AM", (9, 0, False)),
+    ("9:00AM", (9, 0, False)),
+    ("9am", (9, 0, False)),
+    ("3:30 PM", (3, 30, True)),
+    ("09:00", (9, 0, False)),
+    ("17:00", (17, 0, False)),
+    ("0900", (9, 0, False)),
+    ("1230", (12, 30, True)),
+    ("0930am", (9, 30, False)),
+    ("9", (9, 0, False)),
+    ("morning", None),
+    ("25:00", None),
+])
+def test_parse_clock_time(value, expected):
+    """Test the fast path for common clock time formats."""
+    assert _parse_clock_time(value) == expected
+
+@pytest.mark.asyncio
+async def test_availability_question_answered_without_llm():
+    """Test that 'what times are available' on a named date skips the LLM."""
+    with patch('src.bot.chatbot.OPENAI_API_KEY', 'test_api_key'), \
+         patch('src.bot.chatbot.OpenAIFunctionCaller') as MockCaller:
+        agent = CalendarAgent()
+        slots = [
+            {"iso": "2024-06-20T17:00:00.000Z", "display": "Thursday, June 20, 2024 at 10:00 AM PDT"},
+            {"iso": "2024-06-20T17:30:00.000Z", "display": "Thursday, June 20, 2024 at 10:30 AM PDT"},
+        ]
+        agent.get_available_slots = AsyncMock(return_value={"status": "success", "available_slots": slots})
+        
+        response = await agent.process_message("What times are available on 2024-06-20?")
+        
+        agent.get_available_slots.assert_awaited_once_with(date_str="2024-06-20", duration=30)
+        MockCaller.return_value.process_with_function_calling.assert_not_called()
+        assert response["action_taken"] == "get_available_slots"
+        assert "Found 2 available 30-minute slots on 2024-06-20" in response["response"]
+        assert "10:30 AM PDT" in response["response"]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("message", [
+    "book me at 3pm on 2025-05-15, what times are available if not?",
+    "What times are available on 2025-05-15? Cancel my 3pm if so.",
+    "Which slots are available to reschedule to on 2025-05-15?",
+])
+async def test_mixed_availability_message_goes_to_llm(message):
+    """Test that messages mixing an availability question with other requests use the LLM."""
+    with patch('src.bot.chatbot.OPENAI_API_KEY', 'test_api_key'), \
+         patch('src.bot.chatbot.OpenAIFunctionCaller') as MockCaller:
+        MockCaller.return_value.process_with_function_calling = AsyncMock(
+            return_value={"response": "ok", "action_taken": "book_meeting"}
+        )
+        agent = CalendarAgent()
+        agent.get_available_slots = AsyncMock()
+        
+        response = await agent.process_message(message)
+        
+        agent.get_available_slots.assert_not_awaited()
+        MockCaller.return_value.process_with_function_calling.assert_awaited_once()
+        assert response["action_taken"] == "book_meeting"
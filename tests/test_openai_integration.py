@@ -112,4 +112,30 @@ class TestOpenAIFunctionCaller:
             
             # Verify the response is correct
             assert "Great! I've booked your meeting." == response
-            assert result["status"] == "success" 
\ No newline at end of file
+            assert result["status"] == "success" 
+
+    @pytest.mark.parametrize("message, expected", [
+        ("What's the earliest 30-minute slot on 2025-05-15?", "2025-05-15"),
+        ("Find me a time for 2025 5/15 earliest time for 30 min meeting", "2025-05-15"),
+        ("What's the earliest slot available on 05/15/2025?", "2025-05-15"),
+        ("book a 30 min meeting for 2025-05-14T20:30:00.000Z", "2025-05-14"),
+        ("Find the earliest available time for tomorrow", None),
+        ("2025-13-40 does not exist", None),
+    ])
+    def test_extract_explicit_date(self, message, expected):
+        """Test that explicit numeric dates are parsed without the LLM."""
+        caller = OpenAIFunctionCaller(api_key="test_key")
+        assert caller._extract_explicit_date(message) == expected
+
+    @pytest.mark.asyncio
+    async def test_extract_date_skips_llm_for_explicit_dates(self):
+        """Test that the LLM is only consulted when no explicit date is present."""
+        caller = OpenAIFunctionCaller(api_key="test_key")
+        with patch.object(caller, '_extract_datetime_with_llm', new_callable=AsyncMock) as mock_llm:
+            mock_llm.return_value = {"date": "2025-05-16"}
+            
+            assert await caller._extract_date("slots on 2025-05-15?") == "2025-05-15"
+            mock_llm.assert_not_awaited()
+            
+            assert await caller._extract_date("slots tomorrow?") == "2025-05-16"
+            mock_llm.assert_awaited_once_with("slots tomorrow?")